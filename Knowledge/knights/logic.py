@@ -11,6 +11,14 @@ class Sentence():
         """Returns string formula representing logical sentence."""
         return ""
 
+    def truth_table(self, tables, full):
+        """
+        Returns the truth table of the sentence over all models at once, as
+        an integer with bit m set if the sentence is true in model m, given
+        the table of each symbol and full, the integer with every bit set.
+        """
+        raise Exception("nothing to evaluate")
+
     def symbols(self):
         """Returns a set of all symbols in the logical sentence."""
         return set()
@@ -62,6 +70,12 @@ class Symbol(Sentence):
         except KeyError:
             raise Exception(f"variable {self.name} not in model")
 
+    def truth_table(self, tables, full):
+        try:
+            return tables[self.name]
+        except KeyError:
+            raise Exception(f"variable {self.name} not in model")
+
     def formula(self):
         return self.name
 
@@ -86,6 +100,9 @@ class Not(Sentence):
     def evaluate(self, model):
         return not self.operand.evaluate(model)
 
+    def truth_table(self, tables, full):
+        return full ^ self.operand.truth_table(tables, full)
+
     def formula(self):
         return "¬" + Sentence.parenthesize(self.operand.formula())
 
@@ -120,6 +137,12 @@ class And(Sentence):
     def evaluate(self, model):
         return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
 
+    def truth_table(self, tables, full):
+        table = full
+        for conjunct in self.conjuncts:
+            table &= conjunct.truth_table(tables, full)
+        return table
+
     def formula(self):
         if len(self.conjuncts) == 1:
             return self.conjuncts[0].formula()
@@ -151,6 +174,12 @@ class Or(Sentence):
     def evaluate(self, model):
         return any(disjunct.evaluate(model) for disjunct in self.disjuncts)
 
+    def truth_table(self, tables, full):
+        table = 0
+        for disjunct in self.disjuncts:
+            table |= disjunct.truth_table(tables, full)
+        return table
+
     def formula(self):
         if len(self.disjuncts) == 1:
             return self.disjuncts[0].formula()
@@ -183,6 +212,10 @@ class Implication(Sentence):
         return ((not self.antecedent.evaluate(model))
                 or self.consequent.evaluate(model))
 
+    def truth_table(self, tables, full):
+        return ((full ^ self.antecedent.truth_table(tables, full))
+                | self.consequent.truth_table(tables, full))
+
     def formula(self):
         antecedent = Sentence.parenthesize(self.antecedent.formula())
         consequent = Sentence.parenthesize(self.consequent.formula())
@@ -216,6 +249,10 @@ class Biconditional(Sentence):
                 or (not self.left.evaluate(model)
                     and not self.right.evaluate(model)))
 
+    def truth_table(self, tables, full):
+        return full ^ (self.left.truth_table(tables, full)
+                       ^ self.right.truth_table(tables, full))
+
     def formula(self):
         left = Sentence.parenthesize(str(self.left))
         right = Sentence.parenthesize(str(self.right))
@@ -261,3 +298,37 @@ def model_check(knowledge, query):
 
     # Check that knowledge entails query
     return check_all(knowledge, query, symbols, dict())
+
+
+def symbol_tables(symbols):
+    """
+    Returns the truth table of each of a list of symbols over all 2^n
+    models of them, where symbol i is true in model m if bit i of m is set,
+    and the table of a sentence that is true in every model.
+    """
+    size = 2 ** len(symbols)
+    full = (1 << size) - 1
+    tables = {}
+    for i, symbol in enumerate(symbols):
+
+        # Runs of 2^i false models then 2^i true ones, doubled up to size
+        half = 2 ** i
+        table = ((1 << half) - 1) << half
+        length = 2 * half
+        while length < size:
+            table |= table << length
+            length *= 2
+        tables[symbol] = table
+    return tables, full
+
+
+def model_check_compiled(knowledge, query):
+    """
+    Checks if knowledge base entails query, like model_check, by
+    evaluating both over every model at once as integer truth tables.
+    """
+    symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+    tables, full = symbol_tables(symbols)
+
+    # Entailed if no model makes the knowledge true and the query false
+    return knowledge.truth_table(tables, full) & ~query.truth_table(tables, full) == 0
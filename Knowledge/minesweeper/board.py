@@ -0,0 +1,107 @@
+"""
+NumPy-backed Minesweeper board for very large games.
+
+Mines are placed by sampling cell positions without replacement instead of
+retrying random cells until enough are free, and the number of mines next
+to every cell is computed up front for the whole board, so nearby_mines is
+a lookup instead of a scan of the cell's neighborhood. The set of mine
+cells is only built when something asks for it.
+"""
+import argparse
+import functools
+import random
+import time
+
+import numpy as np
+
+from minesweeper import Minesweeper
+
+
+class NumpyMinesweeper(Minesweeper):
+    """
+    Minesweeper game representation with the same interface as
+    Minesweeper, storing its board and neighbor counts as NumPy arrays.
+    """
+
+    def __init__(self, height=8, width=8, mines=8, seed=None):
+
+        # Draw the seed from random by default, so random.seed fixes the board
+        if seed is None:
+            seed = random.getrandbits(64)
+        rng = np.random.default_rng(seed)
+
+        self.height = height
+        self.width = width
+
+        positions = rng.choice(height * width, size=mines, replace=False)
+        self.board = np.zeros((height, width), dtype=bool)
+        self.board.flat[positions] = True
+
+        self.counts = neighbor_counts(self.board)
+
+        # At first, player has found no mines
+        self.mines_found = set()
+
+    @functools.cached_property
+    def mines(self):
+        """
+        Returns the set of (i, j) cells with mines, built on first use.
+        """
+        rows, columns = np.nonzero(self.board)
+        return set(zip(rows.tolist(), columns.tolist()))
+
+    def is_mine(self, cell):
+        return bool(self.board[cell])
+
+    def nearby_mines(self, cell):
+        """
+        Returns the number of mines that are
+        within one row and column of a given cell,
+        not including the cell itself.
+        """
+        return int(self.counts[cell])
+
+
+def neighbor_counts(board):
+    """
+    Returns the number of mines next to each cell of a boolean board,
+    as the sum of the board shifted one cell in each of the 8 directions.
+    """
+    height, width = board.shape
+    padded = np.pad(board.astype(np.uint8), 1)
+    counts = np.zeros((height, width), dtype=np.uint8)
+    for di in range(3):
+        for dj in range(3):
+            if (di, dj) != (1, 1):
+                counts += padded[di:di + height, dj:dj + width]
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time building Minesweeper boards and counting neighbors."
+    )
+    parser.add_argument("--height", type=int, default=1000)
+    parser.add_argument("--width", type=int, default=1000)
+    parser.add_argument("--mines", type=int, default=150000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    for board_class in (Minesweeper, NumpyMinesweeper):
+        start = time.perf_counter()
+        game = board_class(height=args.height, width=args.width, mines=args.mines)
+        built = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(args.height):
+            for j in range(args.width):
+                game.nearby_mines((i, j))
+        counted = (time.perf_counter() - start) / (args.height * args.width)
+        del game
+
+        print(f"{board_class.__name__}: built in {built:.3f}s, "
+              f"{counted * 1e6:.2f}us per nearby_mines")
+
+
+if __name__ == "__main__":
+    main()
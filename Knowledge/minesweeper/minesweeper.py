@@ -1,5 +1,18 @@
 import itertools
+import math
 import random
+import time
+from collections import deque
+
+# Share of unknown cells assumed to be mines when guessing without the mine count
+GUESS_DENSITY = 0.2
+
+# Largest group of linked frontier cells whose mine layouts are enumerated
+MAX_COMPONENT_CELLS = 200
+
+
+class Timeout(Exception):
+    pass
 
 
 class Minesweeper():
@@ -77,6 +90,36 @@ class Minesweeper():
 
         return count
 
+    def reveal(self, cell, revealed=()):
+        """
+        Reveals a cell that is not a mine and, if no mines are next to it,
+        every cell reachable from it through cells with no nearby mines,
+        as clicking it in a Minesweeper game does.
+
+        Returns a list of (cell, nearby mines) pairs for the revealed cells,
+        skipping any that are in revealed.
+        """
+        observations = []
+        seen = {cell}
+        frontier = deque([cell])
+        while frontier:
+            cell = frontier.popleft()
+            count = self.nearby_mines(cell)
+            if cell not in revealed:
+                observations.append((cell, count))
+            if count != 0:
+                continue
+
+            # No neighbor of a cell without nearby mines is a mine
+            for i in range(cell[0] - 1, cell[0] + 2):
+                for j in range(cell[1] - 1, cell[1] + 2):
+                    if (0 <= i < self.height and 0 <= j < self.width
+                            and (i, j) not in seen):
+                        seen.add((i, j))
+                        frontier.append((i, j))
+
+        return observations
+
     def won(self):
         """
         Checks if all mines have been flagged.
@@ -135,6 +178,128 @@ class Sentence():
             self.cells.remove(cell)
 
 
+class BitSentence():
+    """
+    Logical statement about a Minesweeper game, like Sentence, but with its
+    cells stored as the set bits of an integer. Bit k of mask stands for the
+    cell at board position offset + k, where cell (i, j) is at position
+    i * width + j, and offset is the position of the sentence's first cell.
+    Keeping the mask relative to the first cell keeps it a few words long
+    on any board, so subset tests, differences and comparisons are a
+    couple of operations on small integers.
+    """
+
+    __slots__ = ("offset", "mask", "count", "width")
+
+    def __init__(self, offset, mask, count, width):
+        self.offset = offset
+        self.mask = mask
+        self.count = count
+        self.width = width
+        self.normalize()
+
+    @classmethod
+    def from_cells(cls, cells, count, width):
+        positions = [i * width + j for i, j in cells]
+        offset = min(positions, default=0)
+        mask = 0
+        for position in positions:
+            mask |= 1 << (position - offset)
+        return cls(offset, mask, count, width)
+
+    def normalize(self):
+        """
+        Shifts the mask so that its lowest bit is the first cell.
+        """
+        if self.mask and not self.mask & 1:
+            low = (self.mask & -self.mask).bit_length() - 1
+            self.mask >>= low
+            self.offset += low
+
+    def __eq__(self, other):
+        return (self.mask == other.mask and self.offset == other.offset
+                and self.count == other.count)
+
+    def __len__(self):
+        return self.mask.bit_count()
+
+    def __str__(self):
+        return f"{self.cells} = {self.count}"
+
+    def key(self):
+        """
+        Returns a hashable key identifying the sentence by its cells and count.
+        """
+        return self.offset, self.mask, self.count
+
+    def positions(self):
+        """
+        Returns the board positions of the cells in the sentence.
+        """
+        return [self.offset + bit for bit in bits(self.mask)]
+
+    @property
+    def cells(self):
+        """
+        Returns the set of (i, j) cells in the sentence.
+        """
+        return {divmod(position, self.width) for position in self.positions()}
+
+    def known_mines(self):
+        """
+        Returns the set of all cells in the sentence known to be mines.
+        """
+        if self.count == len(self) and self.count != 0:
+            return self.cells
+        return set()
+
+    def known_safes(self):
+        """
+        Returns the set of all cells in the sentence known to be safe.
+        """
+        if self.count == 0:
+            return self.cells
+        return set()
+
+    def remove(self, cell):
+        """
+        Removes a cell from the sentence, returning whether it was in it.
+        """
+        bit = cell[0] * self.width + cell[1] - self.offset
+        if bit < 0 or not self.mask >> bit & 1:
+            return False
+        self.mask ^= 1 << bit
+        self.normalize()
+        return True
+
+    def mark_mine(self, cell):
+        """
+        Updates internal knowledge representation given the fact that
+        a cell is known to be a mine.
+        """
+        if self.remove(cell):
+            self.count -= 1
+
+    def mark_safe(self, cell):
+        """
+        Updates internal knowledge representation given the fact that
+        a cell is known to be safe.
+        """
+        self.remove(cell)
+
+    def issubset(self, other):
+        shift = self.offset - other.offset
+        return shift >= 0 and other.mask >> shift & self.mask == self.mask
+
+    def difference(self, other):
+        """
+        Returns the sentence about the cells of this sentence that are not
+        in other, when other is a subset of this sentence.
+        """
+        mask = self.mask ^ (other.mask << (other.offset - self.offset))
+        return BitSentence(self.offset, mask, self.count - other.count, self.width)
+
+
 class MinesweeperAI():
     """
     Minesweeper game player
@@ -156,6 +321,9 @@ class MinesweeperAI():
         # List of sentences about the game known to be true
         self.knowledge = []
 
+        # Mine layouts of groups of sentences, by the sentences in the group
+        self.guess_cache = {}
+
     def mark_mine(self, cell):
         """
         Marks a cell as a mine, and updates all knowledge
@@ -189,7 +357,29 @@ class MinesweeperAI():
             5) add any new sentences to the AI's knowledge base
                if they can be inferred from existing knowledge
         """
+        self.add_observation(cell, count)
+        self.infer()
+
+    def add_knowledge_batch(self, observations):
+        """
+        Called with a list of (cell, count) pairs for safe cells revealed
+        together, such as by Minesweeper.reveal. Records every one of
+        them as add_knowledge does, then draws inferences once.
+        """
+        # Sentences leave out the other revealed cells once they are known safe
+        for cell, _ in observations:
+            self.moves_made.add(cell)
+            self.mark_safe(cell)
+
+        for cell, count in observations:
+            self.add_observation(cell, count)
+        self.infer()
 
+    def add_observation(self, cell, count):
+        """
+        Marks a cell as a safe move that has been made, and adds
+        the sentence about its neighbors to the knowledge base.
+        """
         self.moves_made.add(cell)
         self.mark_safe(cell)
 
@@ -210,10 +400,21 @@ class MinesweeperAI():
                 if 0 <= ni < self.height and 0 <= nj < self.width:
                     neighboring_cells.add((ni, nj))
 
-        new_sentence = Sentence(neighboring_cells, count)
+        self.add_sentence(neighboring_cells, count)
+
+    def add_sentence(self, cells, count):
+        """
+        Adds a sentence to the knowledge base unless it is empty or already known.
+        """
+        new_sentence = Sentence(cells, count)
         if new_sentence not in self.knowledge and new_sentence.cells:
             self.knowledge.append(new_sentence)
 
+    def infer(self):
+        """
+        Marks cells as safe or as mines, and adds new sentences,
+        until nothing more can be concluded from the knowledge base.
+        """
         knowledge = True
         while knowledge:
             knowledge = False
@@ -273,13 +474,545 @@ class MinesweeperAI():
             1) have not already been chosen, and
             2) are not known to be mines
         """
-        minesweeper_map = [[(i, j) for j in range(0, 8)] for i in range(0, 8)]
-        minesweeper_set = {element for row in minesweeper_map for element in row}
+        available_moves = [(i, j)
+                           for i in range(self.height)
+                           for j in range(self.width)
+                           if (i, j) not in self.moves_made and (i, j) not in self.mines]
+
+        if not available_moves:
+            return None
+        return random.choice(available_moves)
+
+    def make_guess_move(self, mine_count=None, time_limit=0.005):
+        """
+        Returns a move to make on the Minesweeper board: a known safe cell
+        if there is one, and otherwise the cell least likely to be a mine,
+        preferring cells with fewer unknown neighbors. Returns None if
+        every cell has been chosen or is known to be a mine.
+
+        mine_count is the number of mines on the board, if known.
+        """
+        move = self.make_safe_move()
+        if move is not None:
+            return move
+
+        unknown = {(i, j)
+                   for i in range(self.height)
+                   for j in range(self.width)
+                   if (i, j) not in self.moves_made and (i, j) not in self.mines}
+        if not unknown:
+            return None
+
+        probabilities = self.mine_probabilities(unknown, mine_count, time_limit)
+        return min(unknown, key=lambda cell: (
+            probabilities[cell],
+            sum((i, j) in unknown
+                for i in range(cell[0] - 1, cell[0] + 2)
+                for j in range(cell[1] - 1, cell[1] + 2)),
+            cell
+        ))
+
+    def sentences(self):
+        """
+        Returns the sentences in the knowledge base.
+        """
+        return self.knowledge
+
+    def mine_probabilities(self, unknown, mine_count=None, time_limit=0.005):
+        """
+        Returns the probability that each unknown cell is a mine.
+
+        Sentences that share cells are split into independent groups, and
+        every layout of mines consistent with a group is counted. Given the
+        mine count, the groups are combined exactly through the number of
+        mines left for the other unknown cells; otherwise layouts with more
+        mines are weighted by GUESS_DENSITY. Groups that cannot be
+        enumerated within time_limit seconds fall back to the highest mine
+        share among the sentences about each cell, and count as
+        unconstrained cells when combining the rest.
+        """
+        deadline = time.perf_counter() + time_limit
+        if mine_count is None:
+            density = GUESS_DENSITY
+        else:
+            density = max(0, min(1, (mine_count - len(self.mines)) / len(unknown)))
+
+        constraints = [(frozenset(sentence.cells), sentence.count)
+                       for sentence in self.sentences() if sentence.cells]
+        if len(self.guess_cache) > 10000:
+            self.guess_cache.clear()
+
+        probabilities = {}
+        groups = []
+        for group in components(constraints):
+            key = frozenset(group)
+            layouts = self.guess_cache.get(key)
+            if layouts is None:
+                try:
+                    layouts = count_layouts(group, deadline)
+                except Timeout:
+                    for cells, count in group:
+                        for cell in cells:
+                            probabilities[cell] = max(probabilities.get(cell, 0),
+                                                      count / len(cells))
+                    continue
+                self.guess_cache[key] = layouts
+            cells = set().union(*(cells for cells, _ in group))
+            groups.append((cells, layouts))
+
+        if mine_count is not None:
+            free = unknown.difference(*(cells for cells, _ in groups))
+            exact = coupled_probabilities(groups, len(free),
+                                          mine_count - len(self.mines))
+            if exact is not None:
+                group_probabilities, free_probability = exact
+                for cell in free.difference(probabilities):
+                    probabilities[cell] = free_probability
+                probabilities.update(group_probabilities)
+                return probabilities
+
+        for cells, layouts in groups:
+            probabilities.update(layout_probabilities(cells, layouts, density))
+
+        others = unknown.difference(probabilities)
+        if others:
+            if mine_count is None:
+                other_density = density
+            else:
+                expected = mine_count - len(self.mines) - sum(probabilities.values())
+                other_density = max(0, min(1, expected / len(others)))
+            for cell in others:
+                probabilities[cell] = other_density
+
+        return probabilities
+
+
+class IndexedMinesweeperAI(MinesweeperAI):
+    """
+    Minesweeper game player that draws the same inferences as
+    MinesweeperAI, but incrementally: an index from each cell to the
+    sentences containing it means that only sentences touched by a new
+    fact are examined again, and subset candidates are found through
+    shared cells instead of comparing every pair of sentences.
+    """
+
+    def __init__(self, height=8, width=8):
+        super().__init__(height=height, width=width)
+
+        # Sentences by number, the numbers of the sentences containing each
+        # cell, and the number of the sentence with each (cells, count)
+        self.knowledge = {}
+        self.index = {}
+        self.keys = {}
+        self.next_number = 0
+
+        # Numbers of sentences added or changed since they were last examined
+        self.pending = deque()
+        self.pending_numbers = set()
+
+    def sentences(self):
+        return self.knowledge.values()
+
+    def mark_mine(self, cell):
+        """
+        Marks a cell as a mine, and updates the sentences
+        containing that cell to mark it as a mine as well.
+        """
+        self.mines.add(cell)
+        for number in self.index.pop(cell, ()):
+            sentence = self.knowledge[number]
+            key = sentence_key(sentence)
+            sentence.mark_mine(cell)
+            self.update_sentence(number, key)
+
+    def mark_safe(self, cell):
+        """
+        Marks a cell as safe, and updates the sentences
+        containing that cell to mark it as safe as well.
+        """
+        self.safes.add(cell)
+        for number in self.index.pop(cell, ()):
+            sentence = self.knowledge[number]
+            key = sentence_key(sentence)
+            sentence.mark_safe(cell)
+            self.update_sentence(number, key)
 
-        available_moves = minesweeper_set.difference(self.moves_made)
+    def add_sentence(self, cells, count):
+        """
+        Adds a sentence to the knowledge base unless it is empty
+        or already known, and queues it to be examined.
+        """
+        sentence = Sentence(cells, count)
+        key = sentence_key(sentence)
+        if not sentence.cells or key in self.keys:
+            return
+
+        number = self.next_number
+        self.next_number += 1
+        self.knowledge[number] = sentence
+        self.keys[key] = number
+        for cell in sentence.cells:
+            self.index.setdefault(cell, set()).add(number)
+        self.queue(number)
+
+    def update_sentence(self, number, old_key):
+        """
+        Re-files a sentence after one of its cells has been marked, dropping
+        it if it is now empty or the same as another sentence.
+        """
+        if self.keys.get(old_key) == number:
+            del self.keys[old_key]
+
+        sentence = self.knowledge[number]
+        key = sentence_key(sentence)
+        if not sentence.cells or key in self.keys:
+            for cell in sentence.cells:
+                self.index[cell].discard(number)
+            del self.knowledge[number]
+            return
+
+        self.keys[key] = number
+        self.queue(number)
+
+    def queue(self, number):
+        if number not in self.pending_numbers:
+            self.pending_numbers.add(number)
+            self.pending.append(number)
+
+    def infer(self):
+        """
+        Examines queued sentences until none are left, marking cells they
+        show to be safe or mines, and adding the difference of each queued
+        sentence and any sentence that is a subset or superset of it.
+        """
+        while self.pending:
+            number = self.pending.popleft()
+            self.pending_numbers.discard(number)
+            sentence = self.knowledge.get(number)
+            if sentence is None:
+                continue
+
+            safes = sentence.known_safes()
+            mines = sentence.known_mines()
+            if safes or mines:
+                for cell in list(safes):
+                    self.mark_safe(cell)
+                for cell in list(mines):
+                    self.mark_mine(cell)
+                continue
+
+            # Every subset or superset shares at least one cell with it
+            related = set()
+            for cell in sentence.cells:
+                related.update(self.index[cell])
+            related.discard(number)
+
+            for other_number in related:
+                other = self.knowledge[other_number]
+                if sentence.cells < other.cells:
+                    self.add_sentence(other.cells - sentence.cells,
+                                      other.count - sentence.count)
+                elif other.cells < sentence.cells:
+                    self.add_sentence(sentence.cells - other.cells,
+                                      sentence.count - other.count)
+
+
+class BitMinesweeperAI(IndexedMinesweeperAI):
+    """
+    Minesweeper game player that draws the same inferences as
+    IndexedMinesweeperAI, keeping its knowledge as BitSentences. The
+    index and the duplicate check are keyed by board positions and masks,
+    so sentences never have to be turned back into sets of cells.
+    """
 
-        for move in available_moves:
-            if move not in self.mines:
-                return move
+    def mark_mine(self, cell):
+        """
+        Marks a cell as a mine, and updates the sentences
+        containing that cell to mark it as a mine as well.
+        """
+        self.mines.add(cell)
+        for number in self.index.pop(cell[0] * self.width + cell[1], ()):
+            sentence = self.knowledge[number]
+            key = sentence.key()
+            sentence.mark_mine(cell)
+            self.update_sentence(number, key)
 
+    def mark_safe(self, cell):
+        """
+        Marks a cell as safe, and updates the sentences
+        containing that cell to mark it as safe as well.
+        """
+        self.safes.add(cell)
+        for number in self.index.pop(cell[0] * self.width + cell[1], ()):
+            sentence = self.knowledge[number]
+            key = sentence.key()
+            sentence.mark_safe(cell)
+            self.update_sentence(number, key)
+
+    def add_sentence(self, cells, count):
+        """
+        Adds a sentence about a set of (i, j) cells to the knowledge base.
+        """
+        self.add_bit_sentence(BitSentence.from_cells(cells, count, self.width))
+
+    def add_bit_sentence(self, sentence):
+        """
+        Adds a BitSentence to the knowledge base unless it is empty
+        or already known, and queues it to be examined.
+        """
+        key = sentence.key()
+        if not sentence.mask or key in self.keys:
+            return
+
+        number = self.next_number
+        self.next_number += 1
+        self.knowledge[number] = sentence
+        self.keys[key] = number
+        for position in sentence.positions():
+            self.index.setdefault(position, set()).add(number)
+        self.queue(number)
+
+    def update_sentence(self, number, old_key):
+        """
+        Re-files a sentence after one of its cells has been marked, dropping
+        it if it is now empty or the same as another sentence.
+        """
+        if self.keys.get(old_key) == number:
+            del self.keys[old_key]
+
+        sentence = self.knowledge[number]
+        key = sentence.key()
+        if not sentence.mask or key in self.keys:
+            for position in sentence.positions():
+                self.index[position].discard(number)
+            del self.knowledge[number]
+            return
+
+        self.keys[key] = number
+        self.queue(number)
+
+    def infer(self):
+        """
+        Examines queued sentences until none are left, as
+        IndexedMinesweeperAI.infer does.
+        """
+        while self.pending:
+            number = self.pending.popleft()
+            self.pending_numbers.discard(number)
+            sentence = self.knowledge.get(number)
+            if sentence is None:
+                continue
+
+            if sentence.count == 0 or sentence.count == len(sentence):
+                mine = sentence.count != 0
+                for position in sentence.positions():
+                    if mine:
+                        self.mark_mine(divmod(position, self.width))
+                    else:
+                        self.mark_safe(divmod(position, self.width))
+                continue
+
+            related = set()
+            for position in sentence.positions():
+                related.update(self.index[position])
+            related.discard(number)
+
+            for other_number in related:
+                other = self.knowledge[other_number]
+                if sentence.mask == other.mask and sentence.offset == other.offset:
+                    continue
+                if sentence.issubset(other):
+                    self.add_bit_sentence(other.difference(sentence))
+                elif other.issubset(sentence):
+                    self.add_bit_sentence(sentence.difference(other))
+
+
+def sentence_key(sentence):
+    """
+    Returns a hashable key identifying a sentence by its cells and count.
+    """
+    return frozenset(sentence.cells), sentence.count
+
+
+def bits(mask):
+    """
+    Yields the positions of the set bits of a mask, lowest first.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def components(constraints):
+    """
+    Splits a list of (cells, count) constraints into
+    groups of constraints linked by shared cells.
+    """
+    groups = []
+    group_of_cell = {}
+    for constraint in constraints:
+        linked = {group_of_cell[cell] for cell in constraint[0] if cell in group_of_cell}
+        group = [constraint]
+        for number in linked:
+            group.extend(groups[number])
+            groups[number] = None
+        number = len(groups)
+        groups.append(group)
+        for cells, _ in group:
+            for cell in cells:
+                group_of_cell[cell] = number
+    return [group for group in groups if group is not None]
+
+
+def count_layouts(constraints, deadline):
+    """
+    Counts the mine layouts of the cells in a group of (cells, count)
+    constraints that satisfy every constraint.
+
+    Returns a dict mapping each number of mines to the number of layouts
+    with that many mines and, for every cell, the number of those layouts
+    in which the cell is a mine. Raises Timeout if the group is too big or
+    the deadline passes.
+    """
+    # Order cells so that each constraint is decided soon after it is started
+    cells = []
+    seen = set()
+    for constraint_cells, _ in constraints:
+        for cell in sorted(constraint_cells - seen):
+            seen.add(cell)
+            cells.append(cell)
+    if len(cells) > MAX_COMPONENT_CELLS:
+        raise Timeout
+
+    constraints_of_cell = {cell: [] for cell in cells}
+    for number, (constraint_cells, _) in enumerate(constraints):
+        for cell in constraint_cells:
+            constraints_of_cell[cell].append(number)
+    unassigned = [len(constraint_cells) for constraint_cells, _ in constraints]
+    needed = [count for _, count in constraints]
+
+    layouts = {}
+    mined = []
+    nodes = 0
+
+    def assign(position):
+        nonlocal nodes
+        nodes += 1
+        if nodes % 1024 == 0 and time.perf_counter() > deadline:
+            raise Timeout
+
+        if position == len(cells):
+            layout = layouts.setdefault(len(mined), [0, {}])
+            layout[0] += 1
+            for cell in mined:
+                layout[1][cell] = layout[1].get(cell, 0) + 1
+            return
+
+        cell = cells[position]
+        numbers = constraints_of_cell[cell]
+        for mine in (0, 1):
+            if all(0 <= needed[number] - mine <= unassigned[number] - 1
+                   for number in numbers):
+                for number in numbers:
+                    needed[number] -= mine
+                    unassigned[number] -= 1
+                if mine:
+                    mined.append(cell)
+                assign(position + 1)
+                if mine:
+                    mined.pop()
+                for number in numbers:
+                    needed[number] += mine
+                    unassigned[number] += 1
+
+    assign(0)
+    return {mines: (count, mine_counts) for mines, (count, mine_counts) in layouts.items()}
+
+
+def layout_probabilities(cells, layouts, density):
+    """
+    Returns the probability that each cell of a group is a mine, given the
+    layouts found by count_layouts, when each unknown cell is a mine with
+    probability density independently of the others.
+    """
+    if density >= 1:
+        most = max(layouts)
+        return {cell: layouts[most][1].get(cell, 0) / layouts[most][0] for cell in cells}
+
+    ratio = density / (1 - density)
+    total = 0
+    weighted = dict.fromkeys(cells, 0)
+    for mines, (count, mine_counts) in layouts.items():
+        weight = ratio ** mines
+        total += count * weight
+        for cell, mine_count in mine_counts.items():
+            weighted[cell] += mine_count * weight
+
+    return {cell: weighted[cell] / total for cell in cells}
+
+
+def coupled_probabilities(groups, free, remaining):
+    """
+    Returns the probability that each cell of the groups is a mine, and
+    the probability for each of `free` other unknown cells, when exactly
+    `remaining` mines are left among all of them, given the layouts found
+    by count_layouts for each (cells, layouts) group.
+
+    Every layout of the whole board is equally likely, so each total of k
+    mines in the groups is weighted by the comb(free, remaining - k) ways
+    to place the rest. Returns None if no layout fits the mine count.
+    """
+    def weight(mines):
+        if 0 <= remaining - mines <= free:
+            return math.comb(free, remaining - mines)
+        return 0
+
+    # Layouts of the first i groups, and of the groups from i on, by mines
+    tallies = [{mines: count for mines, (count, _) in layouts.items()}
+               for _, layouts in groups]
+    prefixes = [{0: 1}]
+    for tally in tallies:
+        prefixes.append(convolve(prefixes[-1], tally))
+    suffixes = [{0: 1}]
+    for tally in reversed(tallies):
+        suffixes.append(convolve(suffixes[-1], tally))
+    suffixes.reverse()
+
+    total = sum(count * weight(mines) for mines, count in prefixes[-1].items())
+    if total == 0:
         return None
+
+    probabilities = {}
+    for number, (cells, layouts) in enumerate(groups):
+
+        # Ways to complete the board around each number of mines in this group
+        rest = convolve(prefixes[number], suffixes[number + 1])
+        completions = {
+            mines: sum(count * weight(mines + other) for other, count in rest.items())
+            for mines in layouts
+        }
+        for cell in cells:
+            mined = sum(mine_counts.get(cell, 0) * completions[mines]
+                        for mines, (_, mine_counts) in layouts.items())
+            probabilities[cell] = mined / total
+
+    free_probability = 0
+    if free:
+        mined = sum(count * weight(mines) * (remaining - mines)
+                    for mines, count in prefixes[-1].items())
+        free_probability = mined / (free * total)
+    return probabilities, free_probability
+
+
+def convolve(first, second):
+    """
+    Returns the number of combined layouts by number of mines, given the
+    number of layouts by number of mines of two independent sets of cells.
+    """
+    combined = {}
+    for first_mines, first_count in first.items():
+        for second_mines, second_count in second.items():
+            mines = first_mines + second_mines
+            combined[mines] = combined.get(mines, 0) + first_count * second_count
+    return combined
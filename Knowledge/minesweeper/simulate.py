@@ -0,0 +1,205 @@
+"""
+Headless Minesweeper self-play for benchmarking the AI.
+
+Plays seeded games without pygame, on each board size and mine count asked
+for, spread across a pool of worker processes. The AI makes a known safe
+move whenever it has one, and otherwise guesses, either at random or with
+make_guess_move. Reports the win rate, time spent in add_knowledge per
+move, size of the knowledge base and games played per second. With
+--flood-fill, a move opens every cell that Minesweeper.reveal opens and the
+AI learns them all with one add_knowledge_batch call, so cells revealed are
+counted separately from moves.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+
+import minesweeper as ms
+from board import NumpyMinesweeper
+
+AIS = {
+    "MinesweeperAI": ms.MinesweeperAI,
+    "IndexedMinesweeperAI": ms.IndexedMinesweeperAI,
+    "BitMinesweeperAI": ms.BitMinesweeperAI,
+}
+
+BOARDS = {
+    "list": ms.Minesweeper,
+    "numpy": NumpyMinesweeper,
+}
+
+
+def parse_board(text):
+    """
+    Parses a board given as HEIGHTxWIDTHxMINES, such as 16x30x99.
+    """
+    try:
+        height, width, mines = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected HEIGHTxWIDTHxMINES, got {text!r}")
+    if not 0 <= mines < height * width:
+        raise argparse.ArgumentTypeError(f"{mines} mines do not fit a {height}x{width} board")
+    return height, width, mines
+
+
+def play_game(task):
+    """
+    Plays one game and returns a dict of statistics about it.
+    """
+    ai_name, guess, board_type, flood_fill, height, width, mines, seed = task
+
+    # Boards place their mines, and make_random_move guesses, with random
+    random.seed(seed)
+    game = BOARDS[board_type](height=height, width=width, mines=mines)
+    ai = AIS[ai_name](height=height, width=width)
+
+    moves = revealed = guesses = 0
+    inference = max_inference = guessing = 0
+    max_knowledge = 0
+    won = False
+
+    while True:
+        move = ai.make_safe_move()
+        if move is None:
+            start = time.perf_counter()
+            if guess == "best":
+                move = ai.make_guess_move(mine_count=mines)
+            else:
+                move = ai.make_random_move()
+            guessing += time.perf_counter() - start
+            guesses += 1
+        if move is None or game.is_mine(move):
+            break
+
+        start = time.perf_counter()
+        if flood_fill:
+            observations = game.reveal(move, ai.moves_made)
+            ai.add_knowledge_batch(observations)
+            revealed += len(observations)
+        else:
+            ai.add_knowledge(move, game.nearby_mines(move))
+            revealed += 1
+        moves += 1
+        elapsed = time.perf_counter() - start
+        inference += elapsed
+        max_inference = max(max_inference, elapsed)
+        max_knowledge = max(max_knowledge, len(ai.knowledge))
+
+        if len(ai.moves_made) == height * width - mines:
+            won = True
+            break
+
+    return {
+        "won": won,
+        "moves": moves,
+        "revealed": revealed,
+        "guesses": guesses,
+        "inference": inference,
+        "max_inference": max_inference,
+        "guessing": guessing,
+        "max_knowledge": max_knowledge,
+    }
+
+
+def simulate(ai_name, guess, board_type, flood_fill, board, games, seed, pool):
+    """
+    Plays a number of games on one board and returns a
+    JSON-serializable summary of the results.
+    """
+    height, width, mines = board
+    tasks = [(ai_name, guess, board_type, flood_fill, height, width, mines, seed + game)
+             for game in range(games)]
+
+    start = time.perf_counter()
+    if pool is None:
+        results = [play_game(task) for task in tasks]
+    else:
+        results = list(pool.imap_unordered(play_game, tasks, chunksize=8))
+    elapsed = time.perf_counter() - start
+
+    wins = sum(result["won"] for result in results)
+    moves = sum(result["moves"] for result in results)
+    revealed = sum(result["revealed"] for result in results)
+    guesses = sum(result["guesses"] for result in results)
+    inference = sum(result["inference"] for result in results)
+    guessing = sum(result["guessing"] for result in results)
+    return {
+        "ai": ai_name,
+        "guess": guess,
+        "board": board_type,
+        "flood_fill": flood_fill,
+        "height": height,
+        "width": width,
+        "mines": mines,
+        "games": games,
+        "seed": seed,
+        "wins": wins,
+        "win_rate": wins / games if games else 0,
+        "moves": moves,
+        "revealed": revealed,
+        "guesses": guesses,
+        "mean_ms_per_move": inference / moves * 1000 if moves else 0,
+        "max_ms_per_move": max((result["max_inference"] for result in results),
+                               default=0) * 1000,
+        "mean_ms_per_guess": guessing / guesses * 1000 if guesses else 0,
+        "mean_max_knowledge": (sum(result["max_knowledge"] for result in results) / games
+                               if games else 0),
+        "max_knowledge": max((result["max_knowledge"] for result in results), default=0),
+        "seconds": elapsed,
+        "games_per_second": games / elapsed if elapsed else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play headless Minesweeper games with the AI."
+    )
+    parser.add_argument("-n", "--games", type=int, default=1000,
+                        help="games to play on each board")
+    parser.add_argument("--board", action="append", type=parse_board,
+                        help="board as HEIGHTxWIDTHxMINES (repeatable; default: "
+                             "8x8x8, 16x16x40 and 16x30x99)")
+    parser.add_argument("--ai", action="append", choices=sorted(AIS),
+                        help="AI to play with (repeatable; default: IndexedMinesweeperAI)")
+    parser.add_argument("--guess", choices=["random", "best"], default="best",
+                        help="how to move when no cell is known to be safe")
+    parser.add_argument("--board-type", choices=sorted(BOARDS), default="list",
+                        help="Minesweeper, or NumpyMinesweeper from board.py")
+    parser.add_argument("--flood-fill", action="store_true",
+                        help="open connected cells without nearby mines in one move")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the first game; game i uses seed + i")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(),
+                        help="number of worker processes")
+    parser.add_argument("--json", action="store_true",
+                        help="print one JSON object per AI and board")
+    args = parser.parse_args()
+
+    boards = args.board or [(8, 8, 8), (16, 16, 40), (16, 30, 99)]
+    ais = args.ai or ["IndexedMinesweeperAI"]
+
+    pool = multiprocessing.Pool(args.workers) if args.workers > 1 else None
+    try:
+        for ai_name in ais:
+            for board in boards:
+                summary = simulate(ai_name, args.guess, args.board_type, args.flood_fill,
+                                   board, args.games, args.seed, pool)
+                if args.json:
+                    print(json.dumps(summary), flush=True)
+                else:
+                    print(f"{ai_name} {summary['height']}x{summary['width']} with "
+                          f"{summary['mines']} mines: {summary['win_rate']:.1%} won, "
+                          f"{summary['mean_ms_per_move']:.3f}ms per move, "
+                          f"{summary['mean_max_knowledge']:.1f} sentences at peak, "
+                          f"{summary['games_per_second']:.1f} games/s", flush=True)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Answers many degrees-of-separation queries in one run.
+
+Reads one tab-separated "source<TAB>target" pair of names per line from a
+file or stdin, and writes one JSON object per line with the result. A name
+may end with a birth year in parentheses to pick between people sharing it;
+otherwise the one who starred in most movies is used. The graph is loaded
+once, and queries are spread across a pool of worker processes that share
+it read-only.
+
+With --landmarks, only the degrees of separation are reported, answered
+by a landmark index from landmarks.py (built on first use) in
+microseconds whenever its bounds meet, and by a search otherwise.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+
+from landmarks import load_landmarks
+from lookup import NameIndex
+from snapshot import load_snapshot
+
+# Graph, name index and optional landmark index shared by the worker processes
+graph = None
+names = None
+landmarks = None
+
+
+def load(directory, landmark_count):
+    """
+    Loads the graph, name index and, given a number of landmarks,
+    landmark index into this process.
+    """
+    global graph, names, landmarks
+    graph = load_snapshot(directory)
+    names = NameIndex(graph)
+    if landmark_count is not None:
+        landmarks = load_landmarks(directory, graph, landmark_count)
+
+
+def init_worker(directory, landmark_count):
+    """
+    Loads the graph in a worker that did not inherit it from the parent.
+    """
+    if graph is None:
+        load(directory, landmark_count)
+
+
+def resolve(graph, names, name):
+    """
+    Returns the person index for a name, or an error message.
+    """
+    person = names.resolve(name)
+    if person is not None:
+        return person, None
+
+    suggestions = [graph.person_names[match] for match, _ in names.search(name, 3)]
+    if suggestions:
+        return None, f"person not found: {name} (did you mean {', '.join(suggestions)}?)"
+    return None, f"person not found: {name}"
+
+
+def query(graph, names, source_name, target_name, search, distance=None):
+    """
+    Answers one query by name, finding the path with the given search
+    function, and returns the result as a JSON-serializable dict. Given a
+    distance function, only the degrees are found, with that instead.
+    """
+    record = {"source": source_name, "target": target_name}
+
+    source, error = resolve(graph, names, source_name)
+    if error is None:
+        target, error = resolve(graph, names, target_name)
+    if error is not None:
+        record["error"] = error
+        return record
+
+    if distance is not None:
+        record["degrees"] = distance(source, target)
+        return record
+
+    path = search(source, target)
+    if path is None:
+        record["degrees"] = None
+        record["path"] = None
+    else:
+        record["degrees"] = len(path)
+        record["path"] = [
+            {
+                "movie_id": graph.movie_ids[movie],
+                "title": graph.movie_titles[movie],
+                "person_id": graph.person_ids[person],
+                "name": graph.person_names[person],
+            }
+            for movie, person in path
+        ]
+    return record
+
+
+def answer(line):
+    """
+    Answers the query on one input line and returns it as a JSON string.
+    """
+    fields = line.rstrip("\r\n").split("\t")
+    if len(fields) != 2:
+        return json.dumps({"query": line.rstrip("\r\n"),
+                           "error": "expected source<TAB>target"})
+
+    source_name, target_name = fields
+    distance = None if landmarks is None else landmarks.distance
+    return json.dumps(query(graph, names, source_name, target_name,
+                            graph.search, distance))
+
+
+def run(directory, lines, output, workers, landmark_count=None):
+    """
+    Answers every query line and writes the results in input order,
+    reporting only degrees from a landmark index given a number of
+    landmarks.
+    """
+    load(directory, landmark_count)
+
+    # Skip blank lines without losing the order of the rest
+    queries = (line for line in lines if line.strip())
+
+    if workers == 1:
+        for line in queries:
+            output.write(answer(line) + "\n")
+        return
+
+    # Forked workers inherit the loaded graph and word index, spawned ones
+    # map the snapshot and build their own
+    names.build_words()
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with context.Pool(workers, initializer=init_worker,
+                      initargs=(directory, landmark_count)) as pool:
+        for result in pool.imap(answer, queries, chunksize=16):
+            output.write(result + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Answer degrees-of-separation queries in bulk as JSONL."
+    )
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("pairs", nargs="?", default="-",
+                        help="file of tab-separated name pairs (default: stdin)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(),
+                        help="number of worker processes")
+    parser.add_argument("--landmarks", type=int, metavar="COUNT",
+                        help="report only degrees, from a landmark index "
+                             "of this many landmarks")
+    args = parser.parse_args()
+
+    if args.pairs == "-":
+        run(args.directory, sys.stdin, sys.stdout, args.workers, args.landmarks)
+    else:
+        with open(args.pairs, encoding="utf-8") as f:
+            run(args.directory, f, sys.stdout, args.workers, args.landmarks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmarks the degrees search functions on random pairs of people.
+
+For each search, reports the mean time per query and the mean peak memory
+allocated per query, and checks that every search finds paths of the same
+length as shortest_path.
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+import degrees
+
+SEARCHES = {
+    "shortest_path": degrees.shortest_path,
+    "lean_shortest_path": degrees.lean_shortest_path,
+    "bidirectional_path": degrees.bidirectional_path,
+}
+
+
+def measure(search, pairs):
+    """
+    Returns the path lengths found for every pair, the mean seconds per
+    query and the mean peak bytes allocated per query.
+    """
+    lengths = []
+    start = time.perf_counter()
+    for source, target in pairs:
+        path = search(source, target)
+        lengths.append(None if path is None else len(path))
+    elapsed = time.perf_counter() - start
+
+    # Allocations are traced in a separate pass so they do not skew timing
+    peak = 0
+    for source, target in pairs:
+        tracemalloc.start()
+        search(source, target)
+        peak += tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return lengths, elapsed / len(pairs), peak / len(pairs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark degrees searches.")
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("-n", "--queries", type=int, default=100,
+                        help="number of random pairs to search")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print("Loading data...")
+    degrees.load_data(args.directory)
+    print("Data loaded.")
+
+    rng = random.Random(args.seed)
+    person_ids = sorted(degrees.people)
+    pairs = [(rng.choice(person_ids), rng.choice(person_ids))
+             for _ in range(args.queries)]
+
+    expected = None
+    print(f"{'search':<20} {'ms/query':>10} {'KiB/query':>10}")
+    for name, search in SEARCHES.items():
+        lengths, seconds, peak = measure(search, pairs)
+        if expected is None:
+            expected = lengths
+        elif lengths != expected:
+            raise Exception(f"{name} found paths of different lengths")
+        print(f"{name:<20} {seconds * 1000:>10.3f} {peak / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 import csv
 import sys
+from collections import deque
 
-from util import Node, StackFrontier, QueueFrontier
+from snapshot import load_snapshot
+from util import Node, StackFrontier, IndexedQueueFrontier
 
 # Maps names to a set of corresponding person_ids
 names = {}
@@ -57,19 +59,20 @@ def main():
         sys.exit("Usage: python degrees.py [directory]")
     directory = sys.argv[1] if len(sys.argv) == 2 else "large"
 
-    # Load data from files into memory
+    # Map the graph from its snapshot, parsing the CSV files only if needed
     print("Loading data...")
-    load_data(directory)
+    graph = load_snapshot(directory)
     print("Data loaded.")
 
-    source = person_id_for_name(input("Name: "))
+    source = person_for_name(graph, input("Name: "))
     if source is None:
         sys.exit("Person not found.")
-    target = person_id_for_name(input("Name: "))
+    target = person_for_name(graph, input("Name: "))
     if target is None:
         sys.exit("Person not found.")
 
-    path = shortest_path(source, target)
+    # Search over graph indices, as Graph.shortest_path does for IMDB ids
+    path = graph.search(source, target)
 
     if path is None:
         print("Not connected.")
@@ -78,11 +81,12 @@ def main():
         print(f"{degrees} degrees of separation.")
         path = [(None, source)] + path
 
-        print(path)
+        print([(None if movie is None else graph.movie_ids[movie],
+                graph.person_ids[person]) for movie, person in path])
         for i in range(degrees):
-            person1 = people[path[i][1]]["name"]
-            person2 = people[path[i + 1][1]]["name"]
-            movie = movies[path[i + 1][0]]["title"]
+            person1 = graph.person_names[path[i][1]]
+            person2 = graph.person_names[path[i + 1][1]]
+            movie = graph.movie_titles[path[i + 1][0]]
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
@@ -97,7 +101,7 @@ def shortest_path(source, target):
     # TODO
 
     start = Node(state=source, parent=None, action=None)
-    frontier = QueueFrontier()
+    frontier = IndexedQueueFrontier()
     frontier.add(start)
 
     explored = set()
@@ -130,6 +134,137 @@ def shortest_path(source, target):
                 frontier.add(child)
 
 
+def lean_shortest_path(source, target):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target.
+
+    Unlike shortest_path, people are tested against the goal as soon as they
+    are reached, and the search tree is kept in one dict instead of Node
+    objects and neighbor sets.
+
+    If no possible path, returns None.
+    """
+    if source == target:
+        return []
+
+    # Maps each reached person to the (movie_id, person_id) that reached it
+    parents = {source: None}
+    expanded_movies = set()
+    frontier = deque([source])
+
+    while frontier:
+        person_id = frontier.popleft()
+        for movie_id in people[person_id]["movies"]:
+            if movie_id in expanded_movies:
+                continue
+            expanded_movies.add(movie_id)
+
+            for neighbor_id in movies[movie_id]["stars"]:
+                if neighbor_id in parents:
+                    continue
+                parents[neighbor_id] = (movie_id, person_id)
+                if neighbor_id == target:
+                    path = []
+                    while parents[neighbor_id] is not None:
+                        movie_id, parent_id = parents[neighbor_id]
+                        path.append((movie_id, neighbor_id))
+                        neighbor_id = parent_id
+                    path.reverse()
+                    return path
+                frontier.append(neighbor_id)
+
+    return None
+
+
+def bidirectional_path(source, target):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, searching outwards
+    from both people at once until the two searches meet.
+
+    If no possible path, returns None.
+    """
+    if source == target:
+        return []
+
+    # Maps each reached person to the (movie_id, person_id) step back towards
+    # the person the search started from
+    forward = {source: None}
+    backward = {target: None}
+    forward_frontier = [source]
+    backward_frontier = [target]
+    forward_movies = set()
+    backward_movies = set()
+
+    while forward_frontier and backward_frontier:
+
+        # Grow whichever side currently has the smaller frontier
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier, meeting = expand_frontier(
+                forward_frontier, forward, forward_movies, backward
+            )
+        else:
+            backward_frontier, meeting = expand_frontier(
+                backward_frontier, backward, backward_movies, forward
+            )
+
+        if meeting is not None:
+            return join_paths(meeting, forward, backward)
+
+    return None
+
+
+def expand_frontier(frontier, parents, expanded_movies, other_parents):
+    """
+    Expands every person in the frontier by one step, recording how each
+    newly reached person was reached in `parents`.
+
+    Returns the next frontier and the first person also reached by the
+    other search, or None if the two searches have not met yet.
+    """
+    next_frontier = []
+    for person_id in frontier:
+        for movie_id in people[person_id]["movies"]:
+
+            # Every star of a movie is reached the first time it is expanded
+            if movie_id in expanded_movies:
+                continue
+            expanded_movies.add(movie_id)
+
+            for neighbor_id in movies[movie_id]["stars"]:
+                if neighbor_id in parents:
+                    continue
+                parents[neighbor_id] = (movie_id, person_id)
+                if neighbor_id in other_parents:
+                    return next_frontier, neighbor_id
+                next_frontier.append(neighbor_id)
+
+    return next_frontier, None
+
+
+def join_paths(meeting, forward, backward):
+    """
+    Joins the source side and target side of a bidirectional search
+    at the person where they met into a single list of
+    (movie_id, person_id) pairs.
+    """
+    path = []
+    person_id = meeting
+    while forward[person_id] is not None:
+        movie_id, parent_id = forward[person_id]
+        path.append((movie_id, person_id))
+        person_id = parent_id
+    path.reverse()
+
+    person_id = meeting
+    while backward[person_id] is not None:
+        movie_id, person_id = backward[person_id]
+        path.append((movie_id, person_id))
+
+    return path
+
+
 def person_id_for_name(name):
     """
     Returns the IMDB id for a person's name,
@@ -156,6 +291,32 @@ def person_id_for_name(name):
         return person_ids[0]
 
 
+def person_for_name(graph, name):
+    """
+    Returns the graph index of the person with a name,
+    resolving ambiguities by IMDB id as person_id_for_name does.
+    """
+    people = graph.people_for_name(name)
+    person_ids = [graph.person_ids[person] for person in people]
+    if len(person_ids) == 0:
+        return None
+    elif len(person_ids) > 1:
+        print(f"Which '{name}'?")
+        for person, person_id in zip(people, person_ids):
+            name = graph.person_names[person]
+            birth = graph.person_births[person]
+            print(f"ID: {person_id}, Name: {name}, Birth: {birth}")
+        try:
+            person_id = input("Intended Person ID: ")
+            if person_id in person_ids:
+                return people[person_ids.index(person_id)]
+        except ValueError:
+            pass
+        return None
+    else:
+        return people[0]
+
+
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
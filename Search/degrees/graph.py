@@ -0,0 +1,455 @@
+"""
+Compact integer-indexed person/movie graph for degrees of separation.
+
+People and movies are interned into dense integers and the star relation is
+kept in compressed sparse row (CSR) form in both directions, so a search
+walks flat NumPy arrays instead of hashing string IDs.
+"""
+import argparse
+import bisect
+import csv
+import sys
+import time
+from array import array
+
+import numpy as np
+
+
+class StringTable():
+    """
+    Immutable list of strings stored as one UTF-8 buffer plus offsets.
+    """
+
+    def __init__(self, data, offsets):
+
+        # Plain views of memory-mapped arrays skip np.memmap's slow indexing
+        self.data = np.asarray(data)
+        self.offsets = np.asarray(offsets)
+
+    @classmethod
+    def from_strings(cls, strings):
+        encoded = [string.encode("utf-8") for string in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(string) for string in encoded], out=offsets[1:])
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return cls(data, offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.data[start:end].tobytes().decode("utf-8")
+
+
+class SortedView():
+    """
+    Read-only sequence over a string table in sorted order,
+    so that the standard bisect functions can search it.
+    """
+
+    def __init__(self, table, order, key=None):
+        self.table = table
+        self.order = order
+        self.key = key
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, index):
+        string = self.table[self.order[index]]
+        return string if self.key is None else self.key(string)
+
+
+class SearchTree():
+    """
+    One side of a breadth-first search: for every person, the person
+    and movie through which it was first reached (-1 if not yet reached).
+    """
+
+    def __init__(self, graph, root):
+        self.parent_person = np.full(graph.person_count, -1, dtype=np.int32)
+        self.parent_movie = np.full(graph.person_count, -1, dtype=np.int32)
+        self.expanded_movies = np.zeros(graph.movie_count, dtype=bool)
+        self.parent_person[root] = root
+        self.frontier = np.array([root], dtype=np.int32)
+
+    def reached(self, people):
+        return self.parent_person[people] != -1
+
+
+class Graph():
+    """
+    Person -> movie -> person graph over dense integer indices.
+    """
+
+    def __init__(self, person_ids, person_names, person_births,
+                 movie_ids, movie_titles, movie_years,
+                 person_offsets, person_movies, movie_offsets, movie_stars,
+                 person_id_order, name_order):
+        self.person_ids = person_ids
+        self.person_names = person_names
+        self.person_births = person_births
+        self.movie_ids = movie_ids
+        self.movie_titles = movie_titles
+        self.movie_years = movie_years
+
+        # CSR adjacency in both directions
+        self.person_offsets = person_offsets
+        self.person_movies = person_movies
+        self.movie_offsets = movie_offsets
+        self.movie_stars = movie_stars
+
+        # Permutations sorting people by ID and by lowercased name
+        self.person_id_order = person_id_order
+        self.name_order = name_order
+
+    @classmethod
+    def from_rows(cls, people, movies, star_people, star_movies):
+        """
+        Builds a graph from lists of (id, name, birth) people and
+        (id, title, year) movies, and the person and movie index of
+        every row of the star relation.
+        """
+        person_ids = [person[0] for person in people]
+        person_names = [person[1] for person in people]
+        star_people = np.asarray(star_people, dtype=np.int64)
+        star_movies = np.asarray(star_movies, dtype=np.int64)
+
+        # Drop duplicate rows of the star relation
+        edges = np.unique(star_people * max(len(movies), 1) + star_movies)
+        star_people = edges // max(len(movies), 1)
+        star_movies = edges % max(len(movies), 1)
+
+        person_offsets, person_movies = compressed_rows(
+            star_people, star_movies, len(people)
+        )
+        movie_offsets, movie_stars = compressed_rows(
+            star_movies, star_people, len(movies)
+        )
+
+        return cls(
+            person_ids=StringTable.from_strings(person_ids),
+            person_names=StringTable.from_strings(person_names),
+            person_births=StringTable.from_strings(
+                [person[2] for person in people]
+            ),
+            movie_ids=StringTable.from_strings([movie[0] for movie in movies]),
+            movie_titles=StringTable.from_strings(
+                [movie[1] for movie in movies]
+            ),
+            movie_years=StringTable.from_strings([movie[2] for movie in movies]),
+            person_offsets=person_offsets,
+            person_movies=person_movies,
+            movie_offsets=movie_offsets,
+            movie_stars=movie_stars,
+            person_id_order=sorted_order(person_ids),
+            name_order=sorted_order(person_names, key=str.lower),
+        )
+
+    @property
+    def person_count(self):
+        return len(self.person_offsets) - 1
+
+    @property
+    def movie_count(self):
+        return len(self.movie_offsets) - 1
+
+    def person_index(self, person_id):
+        """
+        Returns the index of the person with the given IMDB id, or None.
+        """
+        ids = SortedView(self.person_ids, self.person_id_order)
+        position = bisect.bisect_left(ids, person_id)
+        if position < len(ids) and ids[position] == person_id:
+            return int(self.person_id_order[position])
+        return None
+
+    def people_for_name(self, name):
+        """
+        Returns the indices of every person with the given name,
+        ignoring case.
+        """
+        names = SortedView(self.person_names, self.name_order, key=str.lower)
+        start = bisect.bisect_left(names, name.lower())
+        end = bisect.bisect_right(names, name.lower(), lo=start)
+        return [int(person) for person in self.name_order[start:end]]
+
+    def movies_for_person(self, person):
+        start, end = self.person_offsets[person], self.person_offsets[person + 1]
+        return self.person_movies[start:end]
+
+    def stars_for_movie(self, movie):
+        start, end = self.movie_offsets[movie], self.movie_offsets[movie + 1]
+        return self.movie_stars[start:end]
+
+    def neighbors(self, person):
+        """
+        Returns (movie, person) index pairs for people
+        who starred with a given person.
+        """
+        return {
+            (int(movie), int(neighbor))
+            for movie in self.movies_for_person(person)
+            for neighbor in self.stars_for_movie(movie)
+        }
+
+    def search(self, source, target):
+        """
+        Returns the shortest list of (movie, person) index pairs that
+        connect the source to the target, or None if they are not connected.
+
+        Runs a bidirectional breadth-first search that expands a whole level
+        of the smaller frontier at a time with vectorized array operations.
+        """
+        if source == target:
+            return []
+
+        forward = SearchTree(self, source)
+        backward = SearchTree(self, target)
+
+        while len(forward.frontier) and len(backward.frontier):
+            if len(forward.frontier) <= len(backward.frontier):
+                meeting = self.expand(forward, backward)
+            else:
+                meeting = self.expand(backward, forward)
+            if meeting is not None:
+                return self.join(meeting, forward, backward)
+
+        return None
+
+    def expand(self, tree, other):
+        """
+        Expands the frontier of a search tree by one level.
+
+        Returns a newly reached person already reached by the other tree,
+        or None if the two searches have not met yet.
+        """
+        frontier = tree.frontier
+
+        # Movies of the frontier that this side has not expanded yet
+        movies, origin = gather(self.person_offsets, self.person_movies, frontier)
+        fresh = ~tree.expanded_movies[movies]
+        movies, first = np.unique(movies[fresh], return_index=True)
+        via = frontier[origin[fresh][first]]
+        tree.expanded_movies[movies] = True
+
+        # Stars of those movies that this side has not reached yet
+        stars, origin = gather(self.movie_offsets, self.movie_stars, movies)
+        fresh = ~tree.reached(stars)
+        stars, first = np.unique(stars[fresh], return_index=True)
+        origin = origin[fresh][first]
+        tree.parent_person[stars] = via[origin]
+        tree.parent_movie[stars] = movies[origin]
+        tree.frontier = stars
+
+        meetings = stars[other.reached(stars)]
+        return int(meetings[0]) if len(meetings) else None
+
+    def join(self, meeting, forward, backward):
+        """
+        Joins both sides of a bidirectional search at the person
+        where they met into a single list of (movie, person) pairs.
+        """
+        path = []
+        person = meeting
+        while forward.parent_person[person] != person:
+            path.append((int(forward.parent_movie[person]), person))
+            person = int(forward.parent_person[person])
+        path.reverse()
+
+        person = meeting
+        while backward.parent_person[person] != person:
+            movie = int(backward.parent_movie[person])
+            person = int(backward.parent_person[person])
+            path.append((movie, person))
+
+        return path
+
+    def shortest_path(self, source_id, target_id):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source to the target, as in degrees.shortest_path.
+
+        If no possible path, returns None.
+        """
+        source = self.person_index(source_id)
+        target = self.person_index(target_id)
+        if source is None or target is None:
+            return None
+        path = self.search(source, target)
+        if path is None:
+            return None
+        return [(self.movie_ids[movie], self.person_ids[person])
+                for movie, person in path]
+
+
+def sorted_order(strings, key=None):
+    """
+    Returns the permutation that sorts a list of strings.
+    """
+    if key is not None:
+        strings = [key(string) for string in strings]
+    order = sorted(range(len(strings)), key=strings.__getitem__)
+    return np.array(order, dtype=np.int32)
+
+
+def compressed_rows(rows, columns, row_count):
+    """
+    Returns CSR offsets and column indices for a list of (row, column) edges.
+    """
+    order = np.lexsort((columns, rows))
+    offsets = np.zeros(row_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=row_count), out=offsets[1:])
+    return offsets, columns[order].astype(np.int32)
+
+
+def gather(offsets, values, rows):
+    """
+    Returns the concatenated CSR values of the given rows, along with the
+    position in `rows` that each value came from.
+    """
+    starts = offsets[rows]
+    counts = offsets[rows + 1] - starts
+    origin = np.repeat(np.arange(len(rows)), counts)
+    positions = np.arange(counts.sum()) + np.repeat(
+        starts - (np.cumsum(counts) - counts), counts
+    )
+    return values[positions], origin
+
+
+def load_graph(directory, min_year=None, max_year=None, min_cast=None,
+               births=True, starless=True):
+    """
+    Load data from CSV files into a compact graph, streaming each file once.
+
+    Only movies within the optional year range and with at least `min_cast`
+    stars are kept. People who starred in none of them are kept without
+    movies, so they can still be looked up by name, unless `starless` is
+    false. Birth years are dropped unless `births` is true.
+    """
+    filter_years = min_year is not None or max_year is not None
+
+    # Load movies, keeping those within the year range
+    movies = []
+    movie_index = {}
+    with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            if filter_years:
+                try:
+                    year = int(row["year"])
+                except ValueError:
+                    continue
+                if ((min_year is not None and year < min_year)
+                        or (max_year is not None and year > max_year)):
+                    continue
+            movie_index[row["id"]] = len(movies)
+            movies.append((row["id"], row["title"], row["year"]))
+
+    # Load stars of those movies, interning people as they first appear
+    person_index = {}
+    star_people = array("q")
+    star_movies = array("q")
+    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            movie = movie_index.get(row["movie_id"])
+            if movie is None:
+                continue
+            person = person_index.setdefault(row["person_id"], len(person_index))
+            star_people.append(person)
+            star_movies.append(movie)
+    del movie_index
+
+    # Load names of the people who starred in those movies, and of the rest
+    # after them if starless people are kept
+    people = [None] * len(person_index)
+    with open(f"{directory}/people.csv", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            person = person_index.get(row["id"])
+            if person is None:
+                if not starless:
+                    continue
+                person = person_index[row["id"]] = len(people)
+                people.append(None)
+            birth = row["birth"] if births else ""
+            people[person] = (row["id"], row["name"], birth)
+    del person_index
+
+    star_people = np.frombuffer(star_people, dtype=np.int64)
+    star_movies = np.frombuffer(star_movies, dtype=np.int64)
+
+    # Drop stars with no row in people.csv
+    kept_people = np.array([person is not None for person in people], dtype=bool)
+    edges = kept_people[star_people]
+
+    # Drop movies with too small a cast, counting each star once
+    kept_movies = np.ones(len(movies), dtype=bool)
+    if min_cast is not None:
+        pairs = np.unique(star_people[edges] * max(len(movies), 1) + star_movies[edges])
+        cast = np.bincount(pairs % max(len(movies), 1), minlength=len(movies))
+        kept_movies = cast >= min_cast
+        edges &= kept_movies[star_movies]
+
+        # People left without a movie are unreachable, so drop them too
+        # unless starless people are kept
+        if not starless:
+            kept_people = np.zeros(len(people), dtype=bool)
+            kept_people[star_people[edges]] = True
+
+    # Renumber the remaining people and movies densely
+    person_renumbering = np.cumsum(kept_people) - 1
+    movie_renumbering = np.cumsum(kept_movies) - 1
+    return Graph.from_rows(
+        [person for person, kept in zip(people, kept_people) if kept],
+        [movie for movie, kept in zip(movies, kept_movies) if kept],
+        person_renumbering[star_people[edges]],
+        movie_renumbering[star_movies[edges]],
+    )
+
+
+def peak_memory():
+    """
+    Returns the peak resident memory of this process in bytes,
+    or None where the platform does not report it.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load a degrees data directory and report its footprint."
+    )
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("--min-year", type=int, help="oldest movie year to keep")
+    parser.add_argument("--max-year", type=int, help="newest movie year to keep")
+    parser.add_argument("--min-cast", type=int,
+                        help="smallest number of stars a kept movie must have")
+    parser.add_argument("--no-births", action="store_true",
+                        help="do not keep birth years")
+    parser.add_argument("--no-starless", action="store_true",
+                        help="do not keep people without a kept movie")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    graph = load_graph(args.directory, min_year=args.min_year,
+                       max_year=args.max_year, min_cast=args.min_cast,
+                       births=not args.no_births, starless=not args.no_starless)
+    elapsed = time.perf_counter() - start
+
+    print(f"Loaded {graph.person_count} people, {graph.movie_count} movies "
+          f"and {len(graph.person_movies)} stars in {elapsed:.2f}s.")
+    peak = peak_memory()
+    if peak is not None:
+        print(f"Peak memory: {peak / 2 ** 20:.1f} MiB.")
+
+
+if __name__ == "__main__":
+    main()
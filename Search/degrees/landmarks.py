@@ -0,0 +1,270 @@
+"""
+Landmark distance oracle for degrees of separation.
+
+Breadth-first distances from a few landmark people are precomputed and
+stored next to the graph snapshot. By the triangle inequality, for every
+landmark L both |d(L, s) - d(L, t)| <= d(s, t) <= d(L, s) + d(L, t), which
+bounds any separation with a handful of array lookups. The lower bound is
+also a consistent heuristic for an A* search (ALT) over the graph.
+"""
+import argparse
+import heapq
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+from graph import gather
+from snapshot import load_snapshot, snapshot_key, snapshot_path
+
+# Distance recorded for people a landmark cannot reach
+UNREACHABLE = -1
+
+
+def distances_from(graph, source):
+    """
+    Returns the breadth-first distance from the source to every person.
+    """
+    distances = np.full(graph.person_count, UNREACHABLE, dtype=np.int16)
+    expanded_movies = np.zeros(graph.movie_count, dtype=bool)
+    distances[source] = 0
+    frontier = np.array([source], dtype=np.int32)
+    depth = 0
+
+    while len(frontier):
+        depth += 1
+        movies, _ = gather(graph.person_offsets, graph.person_movies, frontier)
+        movies = np.unique(movies[~expanded_movies[movies]])
+        expanded_movies[movies] = True
+        stars, _ = gather(graph.movie_offsets, graph.movie_stars, movies)
+        frontier = np.unique(stars[distances[stars] == UNREACHABLE])
+        distances[frontier] = depth
+
+    return distances
+
+
+def choose_landmarks(graph, count):
+    """
+    Chooses landmarks by farthest-first selection, starting from the person
+    who starred in the most movies. Returns the landmarks and the distances
+    from each of them.
+    """
+    degrees = np.diff(graph.person_offsets)
+    landmarks = [int(np.argmax(degrees))]
+    distances = [distances_from(graph, landmarks[0])]
+
+    # Distance from each person to the closest landmark chosen so far
+    closest = distances[0].astype(np.int32)
+
+    while len(landmarks) < min(count, graph.person_count):
+        candidates = np.where(closest == UNREACHABLE, -1, closest)
+        candidates[landmarks] = -1
+        landmark = int(np.argmax(candidates))
+        if candidates[landmark] <= 0:
+            break
+        landmarks.append(landmark)
+        distances.append(distances_from(graph, landmark))
+        reached = distances[-1] != UNREACHABLE
+        closest[reached] = np.minimum(closest[reached], distances[-1][reached])
+
+    # One row per person, so a lookup reads one contiguous row
+    return landmarks, np.ascontiguousarray(np.stack(distances, axis=1))
+
+
+class LandmarkIndex():
+    """
+    Precomputed distances from landmark people to every person.
+    """
+
+    def __init__(self, graph, landmarks, distances):
+        self.graph = graph
+        self.landmarks = landmarks
+        self.distances = distances
+
+    @classmethod
+    def build(cls, graph, count=16):
+        landmarks, distances = choose_landmarks(graph, count)
+        return cls(graph, landmarks, distances)
+
+    def bounds(self, source, target):
+        """
+        Returns (lower, upper) bounds on the separation of two people.
+
+        Both bounds are math.inf if the people are known to be unconnected,
+        and the upper bound is math.inf if no landmark reaches both of them.
+        """
+        if source == target:
+            return 0, 0
+        source_distances = self.distances[source].astype(np.int32)
+        target_distances = self.distances[target].astype(np.int32)
+        source_reached = source_distances != UNREACHABLE
+        target_reached = target_distances != UNREACHABLE
+
+        # A landmark reaching exactly one of them separates their components
+        if np.any(source_reached != target_reached):
+            return math.inf, math.inf
+
+        both = source_reached & target_reached
+        if not np.any(both):
+            return 0, math.inf
+        lower = np.abs(source_distances[both] - target_distances[both]).max()
+        upper = (source_distances[both] + target_distances[both]).min()
+        return int(lower), int(upper)
+
+    def distance(self, source, target):
+        """
+        Returns the separation of two people, or None if they are
+        not connected. Answered from the bounds alone whenever they meet,
+        and otherwise by the graph's bidirectional search, which expands
+        whole levels at once and beats the per-person A* search.
+        """
+        lower, upper = self.bounds(source, target)
+        if lower == upper:
+            return None if lower == math.inf else lower
+        path = self.graph.search(source, target)
+        return None if path is None else len(path)
+
+    def search(self, source, target):
+        """
+        Returns the shortest list of (movie, person) index pairs that
+        connect the source to the target, or None if they are not connected,
+        using A* search guided by the landmark lower bounds.
+        """
+        lower, _ = self.bounds(source, target)
+        if lower == math.inf:
+            return None
+        if source == target:
+            return []
+
+        target_distances = self.distances[target].astype(np.int32)
+        target_reached = target_distances != UNREACHABLE
+
+        cost = {source: 0}
+        parents = {source: None}
+        frontier = [(lower, 0, source)]
+        explored = set()
+
+        while frontier:
+            _, distance, person = heapq.heappop(frontier)
+            distance = -distance
+            if person == target:
+                return self.join(parents, target)
+            if person in explored:
+                continue
+            explored.add(person)
+
+            # Lower bounds for every co-star at once
+            movies = self.graph.movies_for_person(person)
+            neighbors, origin = gather(
+                self.graph.movie_offsets, self.graph.movie_stars, movies
+            )
+            neighbor_distances = self.distances[neighbors].astype(np.int32)
+            known = target_reached & (neighbor_distances != UNREACHABLE)
+            estimates = np.where(
+                known, np.abs(neighbor_distances - target_distances), 0
+            ).max(axis=1, initial=0)
+
+            for neighbor, movie, estimate in zip(neighbors.tolist(),
+                                                 movies[origin].tolist(),
+                                                 estimates.tolist()):
+                if distance + 1 < cost.get(neighbor, math.inf):
+                    cost[neighbor] = distance + 1
+                    parents[neighbor] = (movie, person)
+
+                    # Among equal estimates, prefer the deepest person
+                    heapq.heappush(frontier, (
+                        distance + 1 + estimate, -(distance + 1), neighbor
+                    ))
+
+        return None
+
+    def join(self, parents, person):
+        path = []
+        while parents[person] is not None:
+            movie, parent = parents[person]
+            path.append((movie, person))
+            person = parent
+        path.reverse()
+        return path
+
+    def save(self, path, key, count):
+        """
+        Writes the landmarks and distances, tagged with the snapshot key
+        and the number of landmarks that was asked for.
+        """
+        np.save(os.path.join(path, "landmarks.npy"), self.distances)
+        with open(os.path.join(path, "landmarks.json"), "w") as f:
+            json.dump({"key": key, "count": count,
+                       "landmarks": self.landmarks}, f)
+
+    @classmethod
+    def load(cls, graph, path, key, count):
+        """
+        Memory-maps saved landmark distances.
+
+        Returns None if there are none, or they were built for other data
+        or another number of landmarks.
+        """
+        try:
+            with open(os.path.join(path, "landmarks.json")) as f:
+                saved = json.load(f)
+            if saved["key"] != key or saved["count"] != count:
+                return None
+            distances = np.load(os.path.join(path, "landmarks.npy"),
+                                mmap_mode="r")
+        except (OSError, ValueError, KeyError):
+            return None
+        return cls(graph, saved["landmarks"], distances)
+
+
+def load_landmarks(directory, graph=None, count=16,
+                   min_year=None, max_year=None, min_cast=None):
+    """
+    Loads the landmark index for a data directory and load filters,
+    building and saving it first if needed. A given graph must have been
+    loaded with the same filters, as in load_snapshot.
+    """
+    filters = {"min_year": min_year, "max_year": max_year, "min_cast": min_cast}
+    if graph is None:
+        graph = load_snapshot(directory, **filters)
+    path = snapshot_path(directory, **filters)
+    key = snapshot_key(directory, **filters)
+
+    index = LandmarkIndex.load(graph, path, key, count)
+    if index is not None:
+        return index
+
+    index = LandmarkIndex.build(graph, count)
+    try:
+        index.save(path, key, count)
+    except OSError:
+        pass
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the landmark distance index for a data directory."
+    )
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("-n", "--count", type=int, default=16,
+                        help="number of landmarks")
+    parser.add_argument("--min-year", type=int, help="oldest movie year to keep")
+    parser.add_argument("--max-year", type=int, help="newest movie year to keep")
+    parser.add_argument("--min-cast", type=int,
+                        help="smallest number of stars a kept movie must have")
+    args = parser.parse_args()
+
+    filters = {"min_year": args.min_year, "max_year": args.max_year,
+               "min_cast": args.min_cast}
+    start = time.perf_counter()
+    graph = load_snapshot(args.directory, **filters)
+    index = load_landmarks(args.directory, graph, args.count, **filters)
+    elapsed = time.perf_counter() - start
+    print(f"{len(index.landmarks)} landmarks ready in {elapsed:.2f}s.")
+
+
+if __name__ == "__main__":
+    main()
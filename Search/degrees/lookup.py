@@ -0,0 +1,189 @@
+"""
+Name lookup for the degrees graph.
+
+Exact and prefix lookups binary-search the graph's case-insensitive name
+order directly. Fuzzy lookups go through a sorted index of the individual
+words of every name. The index takes seconds to build for millions of
+names, so long-running callers should build it up front with build_words;
+otherwise the first fuzzy lookup builds it.
+"""
+import bisect
+import difflib
+import re
+import threading
+
+import numpy as np
+
+from graph import SortedView, StringTable, sorted_order
+
+# Matches a trailing birth year in a query such as "Kevin Bacon (1958)"
+BIRTH_YEAR = re.compile(r"^(.*?)\s*\((\d{4})\)\s*$")
+
+# Word matches considered per query word, and names scored, per fuzzy search
+WORD_MATCHES = 2000
+CANDIDATES = 32
+
+
+def parse_query(query):
+    """
+    Splits an optional trailing "(birth year)" off a name.
+    """
+    match = BIRTH_YEAR.match(query)
+    if match is None:
+        return query.strip(), None
+    return match.group(1), match.group(2)
+
+
+class NameIndex():
+    """
+    Prefix, fuzzy and non-interactive lookup of people by name.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.names = SortedView(graph.person_names, graph.name_order,
+                                key=str.lower)
+        self.words = None
+        self.word_people = None
+        self.words_lock = threading.Lock()
+
+    def exact(self, name):
+        """
+        Returns every person with exactly the given name, ignoring case.
+        """
+        return self.graph.people_for_name(name)
+
+    def prefix(self, prefix, limit=10):
+        """
+        Returns up to `limit` people whose name starts with the prefix,
+        ignoring case, in alphabetical order.
+        """
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self.names, prefix)
+        matches = []
+        for position in range(start, min(start + limit, len(self.names))):
+            if not self.names[position].startswith(prefix):
+                break
+            matches.append(int(self.graph.name_order[position]))
+        return matches
+
+    def build_words(self):
+        """
+        Indexes every word of every name, sorted alphabetically and, among
+        people sharing a word, by the number of movies they starred in.
+        Safe to call from several threads; the index is only built once.
+        """
+        with self.words_lock:
+            if self.words is not None:
+                return
+
+            # Visit people by movie count so the stable sort keeps that order
+            counts = np.diff(self.graph.person_offsets)
+            words = []
+            people = []
+            for person in np.argsort(-counts, kind="stable").tolist():
+                for word in set(self.graph.person_names[person].lower().split()):
+                    words.append(word)
+                    people.append(person)
+            order = sorted_order(words)
+
+            # Searches only check words, so it must be set last
+            self.word_people = np.array(people, dtype=np.int32)[order]
+            self.words = SortedView(StringTable.from_strings(words), order)
+
+    def word_matches(self, word):
+        """
+        Returns the people with a name word starting with the shortest
+        prefix of the given word matched by at most WORD_MATCHES name words,
+        or the first WORD_MATCHES of the longest prefix matched by any if
+        even that matches more. Among people with the same word, those who
+        starred in more movies come first.
+        """
+        # Each longer prefix narrows the range matched by the one before
+        start, end = 0, len(self.words)
+        for length in range(1, len(word) + 1):
+            prefix = word[:length]
+            lo = bisect.bisect_left(self.words, prefix, start, end)
+            hi = bisect.bisect_right(self.words, prefix + "\uffff", lo, end)
+            if lo == hi:
+                if length == 1:
+                    return self.word_people[:0]
+                break
+            start, end = lo, hi
+            if end - start <= WORD_MATCHES:
+                break
+        return self.word_people[start:min(end, start + WORD_MATCHES)]
+
+    def search(self, query, limit=10):
+        """
+        Returns up to `limit` (person, score) pairs for the names that best
+        match the query, best first. Scores range from 0 to 1, and people
+        who starred in more movies win ties.
+        """
+        if self.words is None:
+            self.build_words()
+        query = query.lower().strip()
+        if not query:
+            return []
+
+        # People sharing the most word prefixes with the query
+        matches = [self.word_matches(word) for word in query.split()]
+        candidates = set(self.exact(query))
+        candidates.update(self.prefix(query, limit))
+        if matches:
+
+            # Among people sharing as many words, those matching rarer words first
+            matches.sort(key=len)
+            people, first, counts = np.unique(np.concatenate(matches),
+                                              return_index=True, return_counts=True)
+            best = np.lexsort((first, -counts))[:CANDIDATES]
+            candidates.update(people[best].tolist())
+
+        # Score names from the highest upper bound down, stopping once no
+        # remaining name can beat the limit-th best, as ties go by movies
+        matcher = difflib.SequenceMatcher(None, "", query)
+        bounded = []
+        for person in candidates:
+            name = self.graph.person_names[person].lower()
+            matcher.set_seq1(name)
+            bound = 1.0 if name == query else max(
+                matcher.quick_ratio(), 0.9 if name.startswith(query) else 0)
+            bounded.append((-bound, person, name))
+        bounded.sort()
+
+        ranked = []
+        for bound, person, name in bounded:
+            if len(ranked) >= limit and -bound < -ranked[limit - 1][0]:
+                break
+            matcher.set_seq1(name)
+            score = matcher.ratio()
+            if name.startswith(query):
+                score = max(score, 0.9)
+            if name == query:
+                score = 1.0
+            ranked.append((-score, -self.movie_count(person), person))
+            ranked.sort()
+        return [(person, -score) for score, _, person in ranked[:limit]]
+
+    def movie_count(self, person):
+        offsets = self.graph.person_offsets
+        return int(offsets[person + 1] - offsets[person])
+
+    def resolve(self, name, birth=None):
+        """
+        Returns the one person meant by a name without asking, or None.
+
+        The name may end with a birth year in parentheses, as in
+        "Kevin Bacon (1958)". Among people sharing the name, those with the
+        given birth year are preferred, then whoever starred in most movies.
+        """
+        name, parsed_birth = parse_query(name)
+        birth = birth or parsed_birth
+
+        people = self.exact(name)
+        if birth is not None:
+            people = [person for person in people
+                      if self.graph.person_births[person] == str(birth)]
+        if not people:
+            return None
+        return max(people, key=lambda person: (self.movie_count(person), -person))
@@ -0,0 +1,180 @@
+"""
+Long-running degrees-of-separation query server.
+
+Loads the graph once and answers HTTP requests on a local port from
+concurrent threads:
+
+    GET /path?source=NAME&target=NAME   result as JSON, in the batch format
+    GET /stats                          request counts, cache hits and a
+                                        latency histogram as JSON
+
+Recent answers are kept in an LRU cache keyed by the resolved people.
+"""
+import argparse
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from batch import query
+from lookup import NameIndex
+from snapshot import load_snapshot
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500,
+                   1000, 2500, 5000, 10000, math.inf)
+
+
+class PathCache():
+    """
+    Thread-safe least-recently-used cache of search results.
+    """
+
+    def __init__(self, search, size):
+        self.search = search
+        self.size = size
+        self.paths = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, source, target):
+        key = (source, target)
+        with self.lock:
+            if key in self.paths:
+                self.paths.move_to_end(key)
+                self.hits += 1
+                return self.paths[key]
+            self.misses += 1
+
+        # Search outside the lock so other queries are not held up
+        path = self.search(source, target)
+
+        with self.lock:
+            self.paths[key] = path
+            self.paths.move_to_end(key)
+            while len(self.paths) > self.size:
+                self.paths.popitem(last=False)
+        return path
+
+
+class LatencyHistogram():
+    """
+    Thread-safe histogram of request latencies.
+    """
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.lock = threading.Lock()
+        self.total = 0
+        self.seconds = 0.0
+
+    def record(self, seconds):
+        milliseconds = seconds * 1000
+        bucket = next(index for index, bound in enumerate(LATENCY_BUCKETS)
+                      if milliseconds <= bound)
+        with self.lock:
+            self.counts[bucket] += 1
+            self.total += 1
+            self.seconds += seconds
+
+    def summary(self):
+        with self.lock:
+            buckets = {
+                ("+Inf" if bound == math.inf else str(bound)): count
+                for bound, count in zip(LATENCY_BUCKETS, self.counts)
+            }
+            mean = self.seconds / self.total * 1000 if self.total else None
+            return {"requests": self.total, "mean_ms": mean,
+                    "buckets_ms": buckets}
+
+
+class DegreesServer(ThreadingHTTPServer):
+    """
+    HTTP server holding the loaded graph, name index, cache and statistics.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, graph, cache_size=1024):
+        super().__init__(address, DegreesHandler)
+        self.graph = graph
+        self.names = NameIndex(graph)
+
+        # Build the word index before any request thread needs it
+        self.names.build_words()
+        self.cache = PathCache(graph.search, cache_size)
+        self.latency = LatencyHistogram()
+
+
+class DegreesHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        start = time.perf_counter()
+        url = urlparse(self.path)
+        parameters = parse_qs(url.query)
+
+        if url.path == "/path":
+            if "source" not in parameters or "target" not in parameters:
+                self.send_json(400, {"error": "source and target are required"})
+                return
+            record = query(self.server.graph, self.server.names,
+                           parameters["source"][0], parameters["target"][0],
+                           self.server.cache)
+            self.send_json(404 if "error" in record else 200, record)
+            self.server.latency.record(time.perf_counter() - start)
+
+        elif url.path == "/stats":
+            cache = self.server.cache
+            self.send_json(200, {
+                "latency": self.server.latency.summary(),
+                "cache": {"size": len(cache.paths), "hits": cache.hits,
+                          "misses": cache.misses},
+            })
+
+        else:
+            self.send_json(404, {"error": f"unknown path: {url.path}"})
+
+    def send_json(self, status, body):
+        content = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        # Latencies are reported through /stats instead of per-request logs
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve degrees-of-separation queries over local HTTP."
+    )
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8050)
+    parser.add_argument("--cache-size", type=int, default=1024,
+                        help="number of recent answers to keep")
+    args = parser.parse_args()
+
+    print("Loading data...")
+    graph = load_snapshot(args.directory)
+    print("Data loaded.")
+
+    server = DegreesServer((args.host, args.port), graph, args.cache_size)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Binary snapshot cache for the degrees graph.
+
+The first load of a data directory parses the CSV files and writes every
+array of the graph into a snapshot directory next to them. Later loads
+memory-map those arrays instead of parsing, so startup is near-instant and
+concurrent processes share the same pages. A snapshot is only reused while
+its format version and the mtimes and sizes of the CSV files still match.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from graph import Graph, StringTable, load_graph
+
+SNAPSHOT_VERSION = 3
+SNAPSHOT_DIRECTORY = ".degrees-snapshot"
+SOURCES = ("people.csv", "movies.csv", "stars.csv")
+
+STRING_TABLES = (
+    "person_ids", "person_names", "person_births",
+    "movie_ids", "movie_titles", "movie_years",
+)
+ARRAYS = (
+    "person_offsets", "person_movies", "movie_offsets", "movie_stars",
+    "person_id_order", "name_order",
+)
+
+
+def snapshot_path(directory, **filters):
+    """
+    Returns the snapshot directory for a data directory and load filters.
+    """
+    active = [f"{name}={value}" for name, value in sorted(filters.items())
+              if value is not None]
+    return os.path.join(directory, "-".join([SNAPSHOT_DIRECTORY] + active))
+
+
+def snapshot_key(directory, **filters):
+    """
+    Returns the key identifying the CSV files and load filters
+    a snapshot was built from.
+    """
+    sources = {}
+    for source in SOURCES:
+        stat = os.stat(os.path.join(directory, source))
+        sources[source] = [stat.st_mtime_ns, stat.st_size]
+    return {"version": SNAPSHOT_VERSION, "sources": sources, "filters": filters}
+
+
+def write_snapshot(graph, path, key):
+    """
+    Writes every array of the graph, and the key, into a snapshot directory.
+    """
+    parent = os.path.dirname(os.path.abspath(path))
+    staging = tempfile.mkdtemp(prefix=".snapshot-", dir=parent)
+    try:
+        for name in STRING_TABLES:
+            table = getattr(graph, name)
+            np.save(os.path.join(staging, f"{name}.data.npy"), table.data)
+            np.save(os.path.join(staging, f"{name}.offsets.npy"), table.offsets)
+        for name in ARRAYS:
+            np.save(os.path.join(staging, f"{name}.npy"), getattr(graph, name))
+
+        # Write the key last, so a snapshot is only valid once complete
+        with open(os.path.join(staging, "key.json"), "w") as f:
+            json.dump(key, f)
+
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.rename(staging, path)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def read_snapshot(path, key):
+    """
+    Memory-maps a graph from a snapshot directory.
+
+    Returns None if there is no snapshot or it does not match the key.
+    """
+    try:
+        with open(os.path.join(path, "key.json")) as f:
+            if json.load(f) != key:
+                return None
+
+        def array(name):
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+
+        fields = {
+            name: StringTable(array(f"{name}.data"), array(f"{name}.offsets"))
+            for name in STRING_TABLES
+        }
+        for name in ARRAYS:
+            fields[name] = array(name)
+    except (OSError, ValueError):
+        return None
+
+    return Graph(**fields)
+
+
+def load_snapshot(directory, min_year=None, max_year=None, min_cast=None):
+    """
+    Loads the graph for a data directory from its snapshot,
+    parsing the CSV files and writing a new snapshot if needed.
+
+    Each combination of load filters (see graph.load_graph)
+    has a snapshot of its own.
+    """
+    filters = {"min_year": min_year, "max_year": max_year, "min_cast": min_cast}
+    path = snapshot_path(directory, **filters)
+    key = snapshot_key(directory, **filters)
+
+    graph = read_snapshot(path, key)
+    if graph is not None:
+        return graph
+
+    graph = load_graph(directory, **filters)
+    try:
+        write_snapshot(graph, path, key)
+    except OSError:
+        # A read-only data directory just means every start parses the CSVs
+        return graph
+    return read_snapshot(path, key) or graph
@@ -0,0 +1,151 @@
+"""
+Benchmarks the tic-tac-toe search functions.
+
+Every search is asked for a move on the same positions: the empty board
+and every position after one move of each player. Reports the nodes
+searched and the time taken, and checks that every search chooses the
+same moves as live_minimax. minimax answers from the opening book when
+book.py has generated one. The transposition table is cleared before each
+search, so cached_minimax pays for solving the game once per run.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import bitboard
+import tictactoe as ttt
+
+# Each search, with the engine module whose terminal() it calls per node
+SEARCHES = {
+    "live_minimax": (ttt, ttt.live_minimax),
+    "alpha_beta_minimax": (ttt, ttt.alpha_beta_minimax),
+    "cached_minimax": (ttt, ttt.cached_minimax),
+    "bitboard.minimax": (bitboard, bitboard.minimax),
+    "minimax": (ttt, ttt.minimax),
+}
+
+
+def positions():
+    """
+    Returns the empty board and every position reached after
+    one move by X, and after one move by each player.
+    """
+    boards = [ttt.initial_state()]
+    for first in sorted(ttt.actions(boards[0])):
+        after_first = ttt.result(boards[0], first)
+        boards.append(after_first)
+        for second in sorted(ttt.actions(after_first)):
+            boards.append(ttt.result(after_first, second))
+    return boards
+
+
+def count_nodes(engine, search, board):
+    """
+    Returns the move chosen by a search and the number of positions
+    it examined, counted as calls to the engine's terminal().
+    """
+    nodes = 0
+    terminal = engine.terminal
+
+    def counting_terminal(board):
+        nonlocal nodes
+        nodes += 1
+        return terminal(board)
+
+    engine.terminal = counting_terminal
+    try:
+        move = search(board)
+    finally:
+        engine.terminal = terminal
+    return move, nodes
+
+
+def expansion_cost(repeat=20000):
+    """
+    Returns the mean seconds to expand one node, making a move and testing
+    the new position, on list-of-lists boards and on bitboards.
+    """
+    board = ttt.result(ttt.result(ttt.initial_state(), (1, 1)), (0, 0))
+    start = time.perf_counter()
+    for _ in range(repeat):
+        ttt.terminal(ttt.result(board, (2, 2)))
+    lists = (time.perf_counter() - start) / repeat
+
+    bits = bitboard.from_board(board)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        bitboard.terminal(bitboard.result(bits, 8))
+    bitboards = (time.perf_counter() - start) / repeat
+
+    return lists, bitboards
+
+
+def parallel_speedup():
+    """
+    Prints the time parallel_minimax takes from the empty board for each
+    number of worker processes, relative to live_minimax: on the first call
+    to a new pool, which starts the workers, and on a second call that
+    reuses them.
+    """
+    board = ttt.initial_state()
+    start = time.perf_counter()
+    expected = ttt.live_minimax(board)
+    baseline = time.perf_counter() - start
+    print(f"{'workers':>7} {'first':>9} {'reused':>9} {'speedup':>8}")
+    print(f"{'serial':>7} {baseline:>9.3f} {baseline:>9.3f} {1:>8.2f}")
+
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            times = []
+            for _ in range(2):
+                start = time.perf_counter()
+                move = ttt.parallel_minimax(board, executor)
+                times.append(time.perf_counter() - start)
+                if move != expected:
+                    raise Exception("parallel_minimax chose a different move than live_minimax")
+        first, reused = times
+        print(f"{workers:>7} {first:>9.3f} {reused:>9.3f} {baseline / reused:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tic-tac-toe searches.")
+    parser.add_argument("--empty-only", action="store_true",
+                        help="only search from the empty board")
+    parser.add_argument("--parallel", action="store_true",
+                        help="time parallel_minimax from the empty board "
+                             "for every number of worker processes")
+    args = parser.parse_args()
+
+    if args.parallel:
+        parallel_speedup()
+        return
+
+    boards = [ttt.initial_state()] if args.empty_only else positions()
+
+    expected = None
+    print(f"{'search':<20} {'positions':>9} {'nodes':>12} {'seconds':>9}")
+    for name, (engine, search) in SEARCHES.items():
+        ttt.transposition_table.clear()
+        moves = []
+        total_nodes = 0
+        start = time.perf_counter()
+        for board in boards:
+            move, nodes = count_nodes(engine, search, board)
+            moves.append(move)
+            total_nodes += nodes
+        elapsed = time.perf_counter() - start
+
+        if expected is None:
+            expected = moves
+        elif moves != expected:
+            raise Exception(f"{name} chose different moves than live_minimax")
+        print(f"{name:<20} {len(boards):>9} {total_nodes:>12} {elapsed:>9.3f}")
+
+    lists, bitboards = expansion_cost()
+    print(f"Node expansion: {lists * 1e6:.2f}us on lists, "
+          f"{bitboards * 1e6:.2f}us on bitboards.")
+
+
+if __name__ == "__main__":
+    main()
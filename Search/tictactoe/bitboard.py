@@ -0,0 +1,161 @@
+"""
+Bitboard Tic Tac Toe engine
+
+A board is a pair (x, o) of 9-bit integers, with bit 3 * i + j set where
+that player has a mark in cell (i, j). Making a move builds a new tuple
+instead of deep-copying a list of lists, and the player to move, the
+winner and whether the game is over are all table lookups.
+"""
+import tictactoe as ttt
+
+FULL = 0b111111111
+
+# Bits of the 3 rows, 3 columns and 2 diagonals
+WIN_MASKS = [
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100,
+]
+
+# Whether each set of marks contains a line, and how many marks it has
+WINNING = [any(marks & mask == mask for mask in WIN_MASKS)
+           for marks in range(FULL + 1)]
+MARKS = [bin(marks).count("1") for marks in range(FULL + 1)]
+
+# Cells tried first by the search: center, corners, edges
+MOVE_ORDER = [3 * i + j for i, j in ttt.MOVE_ORDER]
+
+
+def from_board(board):
+    """
+    Returns the bitboard for a list-of-lists board.
+    """
+    x = o = 0
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == ttt.X:
+                x |= 1 << (3 * i + j)
+            elif board[i][j] == ttt.O:
+                o |= 1 << (3 * i + j)
+    return x, o
+
+
+def to_board(bitboard):
+    """
+    Returns the list-of-lists board for a bitboard.
+    """
+    x, o = bitboard
+    return [[ttt.X if x >> (3 * i + j) & 1 else
+             ttt.O if o >> (3 * i + j) & 1 else ttt.EMPTY
+             for j in range(3)]
+            for i in range(3)]
+
+
+def initial_state():
+    return 0, 0
+
+
+def player(bitboard):
+    x, o = bitboard
+    return ttt.O if MARKS[x] > MARKS[o] else ttt.X
+
+
+def actions(bitboard):
+    """
+    Returns the free cells of the board, center first, then corners.
+    """
+    x, o = bitboard
+    taken = x | o
+    return [cell for cell in MOVE_ORDER if not taken >> cell & 1]
+
+
+def result(bitboard, cell):
+    """
+    Returns the bitboard that results from marking a cell, given as 3 * i + j.
+    """
+    x, o = bitboard
+    if not 0 <= cell < 9:
+        raise Exception(f"Action out of bounds: ({cell // 3}, {cell % 3})!")
+    bit = 1 << cell
+    if (x | o) & bit:
+        raise Exception(f"Cell ({cell // 3}, {cell % 3}) is already taken!")
+    return (x | bit, o) if MARKS[x] == MARKS[o] else (x, o | bit)
+
+
+def winner(bitboard):
+    x, o = bitboard
+    if WINNING[x]:
+        return ttt.X
+    if WINNING[o]:
+        return ttt.O
+    return None
+
+
+def terminal(bitboard):
+    x, o = bitboard
+    return WINNING[x] or WINNING[o] or x | o == FULL
+
+
+def utility(bitboard):
+    x, o = bitboard
+    return 1 if WINNING[x] else -1 if WINNING[o] else 0
+
+
+def value(bitboard, alpha=-2, beta=2):
+    """
+    Returns the minimax value of the board if it lies strictly between
+    alpha and beta, or otherwise a bound on the side of the window it is on.
+    """
+    if terminal(bitboard):
+        return utility(bitboard)
+
+    if player(bitboard) == ttt.X:
+        v = -2
+        for cell in actions(bitboard):
+            v = max(v, value(result(bitboard, cell), alpha, beta))
+            alpha = max(alpha, v)
+            if alpha >= beta:
+                break
+    else:
+        v = 2
+        for cell in actions(bitboard):
+            v = min(v, value(result(bitboard, cell), alpha, beta))
+            beta = min(beta, v)
+            if alpha >= beta:
+                break
+
+    return v
+
+
+def minimax(board):
+    """
+    Returns the optimal action (i, j) for the current player on a
+    list-of-lists board, choosing the same action as tictactoe.minimax.
+    """
+    bitboard = from_board(board)
+    if terminal(bitboard):
+        return None
+
+    current_player = player(bitboard)
+    is_maximizing = current_player == ttt.X
+    best_value = -2 if is_maximizing else 2
+    best_action = None
+
+    # Root actions in the same order as tictactoe.minimax tries them
+    for i, j in ttt.actions(board):
+        result_bitboard = result(bitboard, 3 * i + j)
+        if winner(result_bitboard) == current_player:
+            return i, j
+
+        if is_maximizing:
+            v = value(result_bitboard, best_value, 2)
+            if v > best_value:
+                best_value = v
+                best_action = (i, j)
+        else:
+            v = value(result_bitboard, -2, best_value)
+            if v < best_value:
+                best_value = v
+                best_action = (i, j)
+
+    return best_action
@@ -0,0 +1,53 @@
+"""
+Generates the Tic Tac Toe opening book.
+
+Solves every position reachable from the empty board once, and writes the
+move minimax chooses and the minimax value of each to book.bin, where
+tictactoe.minimax looks them up instead of searching.
+"""
+import sys
+
+import tictactoe as ttt
+
+
+def reachable_positions():
+    """
+    Returns every position reachable from the empty board.
+    """
+    positions = {}
+    stack = [ttt.initial_state()]
+    while stack:
+        board = stack.pop()
+        key = ttt.board_key(board, symmetries=False)
+        if key in positions:
+            continue
+        positions[key] = board
+        if not ttt.terminal(board):
+            for action in ttt.actions(board):
+                stack.append(ttt.result(board, action))
+    return positions
+
+
+def generate_book():
+    """
+    Returns the contents of the opening book.
+    """
+    table = bytearray([ttt.BOOK_MISSING]) * ttt.BOOK_SIZE
+    for key, board in reachable_positions().items():
+        action = ttt.cached_minimax(board)
+        cell = ttt.BOOK_NO_MOVE if action is None else 3 * action[0] + action[1]
+        table[key] = (ttt.cached_value(board) + 1) << 4 | cell
+    return bytes(table)
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else ttt.BOOK_PATH
+    table = generate_book()
+    with open(path, "wb") as f:
+        f.write(table)
+    positions = sum(entry != ttt.BOOK_MISSING for entry in table)
+    print(f"Wrote {positions} positions to {path}.")
+
+
+if __name__ == "__main__":
+    main()
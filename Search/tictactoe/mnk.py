@@ -0,0 +1,256 @@
+"""
+m,n,k-game Player
+
+Boards are lists of m rows of n cells, as in tictactoe.py, and a player wins
+by getting k marks in a row, column or diagonal. Tic Tac Toe is the 3,3,3
+game; gomoku is the 15,15,5 game. Larger boards are far too big for a full
+minimax search, so best_action runs an iterative-deepening alpha-beta search
+with a heuristic evaluation that stops when its time budget runs out.
+"""
+import functools
+import time
+
+X = "X"
+O = "O"
+EMPTY = None
+
+# Score of a won game; quicker wins score higher
+WIN_SCORE = 1_000_000
+
+# Cells around existing marks considered as moves by best_action
+NEIGHBORHOOD = 2
+
+
+class Timeout(Exception):
+    pass
+
+
+def initial_state(m=3, n=3):
+    """
+    Returns an empty board with m rows and n columns.
+    """
+    return [[EMPTY] * n for _ in range(m)]
+
+
+def player(board):
+    """
+    Returns player who has the next turn on a board.
+    """
+    x_count = sum(row.count(X) for row in board)
+    o_count = sum(row.count(O) for row in board)
+
+    return O if x_count > o_count else X
+
+
+def actions(board):
+    """
+    Returns set of all possible actions (i, j) available on the board.
+    """
+    return {(i, j)
+            for i, row in enumerate(board)
+            for j, cell in enumerate(row)
+            if cell is EMPTY}
+
+
+def result(board, action):
+    """
+    Returns the board that results from making move (i, j) on the board.
+    """
+    i, j = action
+
+    if not (0 <= i < len(board) and 0 <= j < len(board[0])):
+        raise Exception(f"Action out of bounds: ({i}, {j})!")
+    if board[i][j] is not EMPTY:
+        raise Exception(f"Cell ({i}, {j}) is already taken!")
+
+    copied_board = [row.copy() for row in board]
+    copied_board[i][j] = player(board)
+
+    return copied_board
+
+
+@functools.lru_cache(maxsize=None)
+def lines(m, n, k):
+    """
+    Returns every run of k cells in a row, column or diagonal
+    of an m by n board, as tuples of (i, j) cells.
+    """
+    runs = []
+    for i in range(m):
+        for j in range(n):
+            for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_i, end_j = i + di * (k - 1), j + dj * (k - 1)
+                if 0 <= end_i < m and 0 <= end_j < n:
+                    runs.append(tuple((i + di * step, j + dj * step)
+                                      for step in range(k)))
+    return tuple(runs)
+
+
+def winner(board, k):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    for line in lines(len(board), len(board[0]), k):
+        i, j = line[0]
+        first = board[i][j]
+        if first is not EMPTY and all(board[i][j] == first for i, j in line[1:]):
+            return first
+
+    return None
+
+
+def terminal(board, k):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    if winner(board, k) is not None:
+        return True
+
+    for row in board:
+        if EMPTY in row:
+            return False
+
+    return True
+
+
+def utility(board, k):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    winner_of_board = winner(board, k)
+    return 1 if winner_of_board == X else -1 if winner_of_board == O else 0
+
+
+def evaluate(board, k):
+    """
+    Returns a heuristic score of a position that is not over, positive when
+    it favors X. Every run of k cells still open to only one player counts
+    for that player, more the more of it they have already marked.
+    """
+    score = 0
+    for line in lines(len(board), len(board[0]), k):
+        x_count = o_count = 0
+        for i, j in line:
+            if board[i][j] == X:
+                x_count += 1
+            elif board[i][j] == O:
+                o_count += 1
+        if x_count and not o_count:
+            score += 4 ** x_count
+        elif o_count and not x_count:
+            score -= 4 ** o_count
+    return score
+
+
+def candidate_actions(board):
+    """
+    Returns the empty cells near existing marks, closest to the
+    center first, or the center cell of an empty board.
+    A full board has none.
+    """
+    m, n = len(board), len(board[0])
+    marked = [(i, j) for i in range(m) for j in range(n) if board[i][j] is not EMPTY]
+    if not marked:
+        return [(m // 2, n // 2)]
+
+    candidates = set()
+    for i, j in marked:
+        for ni in range(max(0, i - NEIGHBORHOOD), min(m, i + NEIGHBORHOOD + 1)):
+            for nj in range(max(0, j - NEIGHBORHOOD), min(n, j + NEIGHBORHOOD + 1)):
+                if board[ni][nj] is EMPTY:
+                    candidates.add((ni, nj))
+
+    # Marks may surround every nearby cell while others are still empty
+    if not candidates:
+        candidates = actions(board)
+    return sorted(candidates,
+                  key=lambda cell: (abs(2 * cell[0] - m + 1) + abs(2 * cell[1] - n + 1), cell))
+
+
+def alpha_beta(board, k, depth, alpha, beta, ply, deadline):
+    """
+    Returns the score of the board searched depth moves ahead with
+    alpha-beta pruning, scoring unfinished positions with evaluate().
+
+    Raises Timeout once the deadline has passed.
+    """
+    if deadline is not None and time.perf_counter() > deadline:
+        raise Timeout
+
+    winner_of_board = winner(board, k)
+    if winner_of_board == X:
+        return WIN_SCORE - ply
+    if winner_of_board == O:
+        return -(WIN_SCORE - ply)
+    moves = candidate_actions(board)
+    if not moves:
+        return 0
+    if depth == 0:
+        return evaluate(board, k)
+
+    if player(board) == X:
+        v = float('-inf')
+        for action in moves:
+            v = max(v, alpha_beta(result(board, action), k, depth - 1,
+                                  alpha, beta, ply + 1, deadline))
+            alpha = max(alpha, v)
+            if alpha >= beta:
+                break
+    else:
+        v = float('inf')
+        for action in moves:
+            v = min(v, alpha_beta(result(board, action), k, depth - 1,
+                                  alpha, beta, ply + 1, deadline))
+            beta = min(beta, v)
+            if alpha >= beta:
+                break
+
+    return v
+
+
+def best_action(board, k, time_limit=1.0, max_depth=None):
+    """
+    Returns an action for the current player on the board, or None if the
+    game is over.
+
+    Searches one move deeper at a time, trying the previous best move first,
+    and returns the best move of the deepest search that finished within
+    time_limit seconds (None for no limit). The first, one-move search
+    always finishes.
+    """
+    if terminal(board, k):
+        return None
+
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    moves = candidate_actions(board)
+    empty_cells = sum(row.count(EMPTY) for row in board)
+    max_depth = empty_cells if max_depth is None else min(max_depth, empty_cells)
+    is_maximizing = player(board) == X
+    best = moves[0]
+
+    for depth in range(1, max_depth + 1):
+        try:
+            scores = {}
+            alpha, beta = float('-inf'), float('inf')
+            for action in moves:
+                score = alpha_beta(result(board, action), k, depth - 1,
+                                   alpha, beta, 1, deadline if depth > 1 else None)
+                scores[action] = score
+                if is_maximizing:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+        except Timeout:
+            break
+
+        # Keep the first of the best moves, and try it first next time
+        choose = max if is_maximizing else min
+        best = choose(moves, key=lambda action: scores[action])
+        moves.remove(best)
+        moves.insert(0, best)
+
+        # A forced win or loss will not change with a deeper search
+        if abs(scores[best]) > WIN_SCORE // 2:
+            break
+
+    return best
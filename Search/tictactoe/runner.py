@@ -1,9 +1,30 @@
 import pygame
 import sys
+import threading
 import time
 
 import tictactoe as ttt
 
+# Seconds the AI waits before playing, however fast its search is
+AI_DELAY = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+FRAME_RATE = 60
+
+
+def start_ai_move(board):
+    """
+    Searches for the AI's move on the board in a daemon thread, so the
+    window keeps responding and quitting never waits for the search.
+    Returns a dict that holds the move under "action" once it is found.
+    """
+    move = {}
+
+    def search():
+        move["action"] = ttt.minimax(board)
+
+    threading.Thread(target=search, daemon=True).start()
+    return move
+
+
 pygame.init()
 size = width, height = 600, 400
 
@@ -19,7 +40,11 @@ moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
 
 user = None
 board = ttt.initial_state()
-ai_turn = False
+
+# Move the AI is searching for, started once and then polled every frame
+ai_move = None
+ai_move_started = None
+clock = pygame.time.Clock()
 
 while True:
 
@@ -108,15 +133,14 @@ while True:
         titleRect.center = ((width / 2), 30)
         screen.blit(title, titleRect)
 
-        # Check for AI move
+        # Check for AI move, started once and then polled every frame
         if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.minimax(board)
-                board = ttt.result(board, move)
-                ai_turn = False
-            else:
-                ai_turn = True
+            if ai_move is None:
+                ai_move = start_ai_move(board)
+                ai_move_started = time.monotonic()
+            elif "action" in ai_move and time.monotonic() - ai_move_started >= AI_DELAY:
+                board = ttt.result(board, ai_move["action"])
+                ai_move = None
 
         # Check for a user move
         click, _, _ = pygame.mouse.get_pressed()
@@ -141,6 +165,7 @@ while True:
                     time.sleep(0.2)
                     user = None
                     board = ttt.initial_state()
-                    ai_turn = False
+                    ai_move = None
 
     pygame.display.flip()
+    clock.tick(FRAME_RATE)
@@ -0,0 +1,119 @@
+"""
+Headless Tic Tac Toe tournament for regression-testing search engines.
+
+Plays games without pygame, either AI against AI or AI against a random
+player (with the AI taking X and O in alternate games), and reports win and
+draw counts, positions searched and time per move. A perfect player never
+loses, so any AI loss is reported as an error.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+import tictactoe as ttt
+from benchmark import SEARCHES, count_nodes
+
+
+def play_game(engine, search, ai_players, rng):
+    """
+    Plays one game, with the search moving for the players in ai_players
+    and uniformly random moves for the others.
+
+    Returns the winner and a list of (nodes, seconds) for every AI move.
+    """
+    board = ttt.initial_state()
+    moves = []
+    while not ttt.terminal(board):
+        if ttt.player(board) in ai_players:
+            start = time.perf_counter()
+            action, nodes = count_nodes(engine, search, board)
+            moves.append((nodes, time.perf_counter() - start))
+        else:
+            action = rng.choice(sorted(ttt.actions(board)))
+        board = ttt.result(board, action)
+    return ttt.winner(board), moves
+
+
+def tournament(name, games, opponent, seed):
+    """
+    Plays a number of games with the named search and returns a
+    JSON-serializable summary of the results.
+    """
+    engine, search = SEARCHES[name]
+    rng = random.Random(seed)
+    ttt.transposition_table.clear()
+
+    results = {"X": 0, "O": 0, "draw": 0}
+    ai_losses = 0
+    moves = []
+    start = time.perf_counter()
+
+    for game in range(games):
+        if opponent == "ai":
+            ai_players = {ttt.X, ttt.O}
+        else:
+            ai_players = {ttt.X} if game % 2 == 0 else {ttt.O}
+
+        winner, game_moves = play_game(engine, search, ai_players, rng)
+        results[winner or "draw"] += 1
+        if winner is not None and winner not in ai_players:
+            ai_losses += 1
+        moves.extend(game_moves)
+
+    elapsed = time.perf_counter() - start
+    nodes = sum(move[0] for move in moves)
+    seconds = sum(move[1] for move in moves)
+    return {
+        "engine": name,
+        "opponent": opponent,
+        "games": games,
+        "seed": seed,
+        "x_wins": results["X"],
+        "o_wins": results["O"],
+        "draws": results["draw"],
+        "ai_losses": ai_losses,
+        "ai_moves": len(moves),
+        "nodes": nodes,
+        "mean_nodes_per_move": nodes / len(moves) if moves else 0,
+        "mean_ms_per_move": seconds / len(moves) * 1000 if moves else 0,
+        "max_ms_per_move": max((move[1] for move in moves), default=0) * 1000,
+        "games_per_second": games / elapsed if elapsed else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play headless Tic Tac Toe games between search engines."
+    )
+    parser.add_argument("-n", "--games", type=int, default=100)
+    parser.add_argument("--engine", action="append", choices=sorted(SEARCHES),
+                        help="search to play with (repeatable; default: all "
+                             "except live_minimax)")
+    parser.add_argument("--opponent", choices=["ai", "random"], default="random",
+                        help="play the AI against itself or a random player")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true",
+                        help="print one JSON object per engine")
+    args = parser.parse_args()
+
+    engines = args.engine or [name for name in SEARCHES if name != "live_minimax"]
+    failed = False
+    for name in engines:
+        summary = tournament(name, args.games, args.opponent, args.seed)
+        failed = failed or summary["ai_losses"] > 0
+        if args.json:
+            print(json.dumps(summary))
+        else:
+            print(f"{name}: {summary['x_wins']} X wins, {summary['o_wins']} O wins, "
+                  f"{summary['draws']} draws, {summary['ai_losses']} AI losses, "
+                  f"{summary['mean_nodes_per_move']:.0f} nodes and "
+                  f"{summary['mean_ms_per_move']:.3f}ms per move")
+
+    if failed:
+        sys.exit("An AI lost a game.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,101 +1,107 @@
 """
 Tic Tac Toe Player
 """
-import copy
-
-X = "X"
-O = "O"
-EMPTY = None
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import mnk
+
+X = mnk.X
+O = mnk.O
+EMPTY = mnk.EMPTY
+
+# Tic Tac Toe is the 3,3,3 game: three in a row on a 3 by 3 board
+K = 3
+
+# Order in which the alpha-beta search tries cells: center, corners, edges
+MOVE_ORDER = [(1, 1), (0, 0), (0, 2), (2, 0), (2, 2),
+              (0, 1), (1, 0), (1, 2), (2, 1)]
+
+# The 8 rotations and reflections of the board, as maps of cell (i, j)
+SYMMETRIES = [
+    lambda i, j: (i, j),
+    lambda i, j: (j, 2 - i),
+    lambda i, j: (2 - i, 2 - j),
+    lambda i, j: (2 - j, i),
+    lambda i, j: (i, 2 - j),
+    lambda i, j: (2 - i, j),
+    lambda i, j: (j, i),
+    lambda i, j: (2 - j, 2 - i),
+]
+
+# Base-3 place value of each cell under each symmetry
+SYMMETRY_WEIGHTS = [
+    [[3 ** (3 * symmetry(i, j)[0] + symmetry(i, j)[1]) for j in range(3)]
+     for i in range(3)]
+    for symmetry in SYMMETRIES
+]
+CELL_CODES = {EMPTY: 0, X: 1, O: 2}
+
+# Minimax values of solved positions, shared by every search in the process
+transposition_table = {}
+
+# Opening book of one byte per board_key(board, symmetries=False): the best
+# cell 3 * i + j in the low 4 bits (BOOK_NO_MOVE once the game is over) and
+# the minimax value plus 1 in the high 4 bits, or BOOK_MISSING
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+BOOK_SIZE = 3 ** 9
+BOOK_NO_MOVE = 0x0F
+BOOK_MISSING = 0xFF
+
+# Contents of the opening book once loaded, or False if there is none
+book = None
+
+# Worker processes of parallel_minimax, started on first use and reused
+process_pool = None
 
 
 def initial_state():
     """
     Returns starting state of the board.
     """
-    return [[EMPTY, EMPTY, EMPTY],
-            [EMPTY, EMPTY, EMPTY],
-            [EMPTY, EMPTY, EMPTY]]
+    return mnk.initial_state(3, 3)
 
 
 def player(board):
     """
     Returns player who has the next turn on a board.
     """
-    x_count = sum(row.count(X) for row in board)
-    o_count = sum(row.count(O) for row in board)
-
-    return O if x_count > o_count else X
+    return mnk.player(board)
 
 
 def actions(board):
     """
     Returns set of all possible actions (i, j) available on the board.
     """
-    possible_actions = set()
-    for i in range(3):
-        for j in range(3):
-            if board[i][j] == EMPTY:
-                possible_actions.add((i, j))
-
-    return possible_actions
+    return mnk.actions(board)
 
 
 def result(board, action):
     """
     Returns the board that results from making move (i, j) on the board.
     """
-    i, j = action
-    copied_board = copy.deepcopy(board)
-
-    if not (0 <= i <= 2 and 0 <= j <= 2):
-        raise Exception(f"Action out of bounds: ({i}, {j})!")
-    if board[i][j] is not EMPTY:
-        raise Exception(f"Cell ({i}, {j}) is already taken!")
-
-    player_turn = player(board)
-    copied_board[i][j] = player_turn
-
-    return copied_board
+    return mnk.result(board, action)
 
 
 def winner(board):
     """
     Returns the winner of the game, if there is one.
     """
-    for i in range(3):
-        if board[i][0] == board[i][1] == board[i][2] and board[i][0] is not EMPTY:
-            return board[i][0]
-        if board[0][i] == board[1][i] == board[2][i] and board[0][i] is not EMPTY:
-            return board[0][i]
-
-    if board[0][0] == board[1][1] == board[2][2] and board[0][0] is not EMPTY:
-        return board[0][0]
-    if board[2][0] == board[1][1] == board[0][2] and board[2][0] is not EMPTY:
-        return board[2][0]
-
-    return None
+    return mnk.winner(board, K)
 
 
 def terminal(board):
     """
     Returns True if game is over, False otherwise.
     """
-    if winner(board) is not None:
-        return True
-
-    for row in board:
-        if EMPTY in row:
-            return False
-
-    return True
+    return mnk.terminal(board, K)
 
 
 def utility(board):
     """
     Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
     """
-    winner_of_board = winner(board)
-    return 1 if winner_of_board == X else -1 if winner_of_board == O else 0
+    return mnk.utility(board, K)
 
 
 def min_value(board):
@@ -121,6 +127,21 @@ def max_value(board):
 def minimax(board):
     """
     Returns the optimal action for the current player on the board.
+
+    Looks the board up in the opening book when one has been generated
+    (see book.py), and otherwise searches the game tree through the
+    transposition table, so a whole game solves each position only once.
+    """
+    entry = book_entry(board)
+    if entry is not None:
+        return entry[0]
+    return cached_minimax(board)
+
+
+def live_minimax(board):
+    """
+    Returns the optimal action for the current player on the board,
+    searching the full game tree.
     """
     current_player = player(board)
 
@@ -136,7 +157,7 @@ def minimax(board):
             if winner(result_board) == current_player:
                 return action
 
-            value = max_value(result_board) if is_maximizing else min_value(result_board)
+            value = min_value(result_board) if is_maximizing else max_value(result_board)
 
             if (is_maximizing and value > best_value) or (not is_maximizing and value < best_value):
                 best_value = value
@@ -145,3 +166,218 @@ def minimax(board):
         return best_action
 
     return optimal_value(current_player == X)
+
+
+def root_value(board, action):
+    """
+    Returns the minimax value of the board after the current player
+    takes the action.
+    """
+    result_board = result(board, action)
+    return min_value(result_board) if player(board) == X else max_value(result_board)
+
+
+def shared_process_pool():
+    """
+    Returns the process pool parallel_minimax uses by default,
+    with one worker per CPU, starting it on first use.
+    """
+    global process_pool
+    if process_pool is None:
+        process_pool = ProcessPoolExecutor()
+    return process_pool
+
+
+def parallel_minimax(board, executor=None):
+    """
+    Returns the optimal action for the current player on the board,
+    choosing the same action as live_minimax.
+
+    Each root action's subtree is searched in a worker process of the given
+    executor, or of the shared process pool, and the values are combined in
+    the order live_minimax tries the actions.
+    """
+    if terminal(board):
+        return None
+
+    current_player = player(board)
+    root_actions = list(actions(board))
+    for action in root_actions:
+        if winner(result(board, action)) == current_player:
+            return action
+
+    if executor is None:
+        executor = shared_process_pool()
+    values = list(executor.map(root_value, [board] * len(root_actions), root_actions))
+
+    is_maximizing = current_player == X
+    best_value = float('-inf') if is_maximizing else float('inf')
+    best_action = None
+    for action, value in zip(root_actions, values):
+        if (is_maximizing and value > best_value) or (not is_maximizing and value < best_value):
+            best_value = value
+            best_action = action
+
+    return best_action
+
+
+def ordered_actions(board):
+    """
+    Returns the actions available on the board, most promising first.
+    """
+    return [(i, j) for i, j in MOVE_ORDER if board[i][j] == EMPTY]
+
+
+def alpha_beta_value(board, alpha, beta):
+    """
+    Returns the minimax value of the board if it lies strictly between
+    alpha and beta, or otherwise a bound on the side of the window it is on.
+    """
+    if terminal(board):
+        return utility(board)
+
+    if player(board) == X:
+        v = float('-inf')
+        for action in ordered_actions(board):
+            v = max(v, alpha_beta_value(result(board, action), alpha, beta))
+            alpha = max(alpha, v)
+            if alpha >= beta:
+                break
+    else:
+        v = float('inf')
+        for action in ordered_actions(board):
+            v = min(v, alpha_beta_value(result(board, action), alpha, beta))
+            beta = min(beta, v)
+            if alpha >= beta:
+                break
+
+    return v
+
+
+def alpha_beta_minimax(board):
+    """
+    Returns the optimal action for the current player on the board,
+    using alpha-beta pruning.
+
+    The root actions are tried in the same order as minimax, and each one is
+    searched with a window that only admits strictly better values, so the
+    action chosen is always the one minimax would choose.
+    """
+    if terminal(board):
+        return None
+
+    current_player = player(board)
+    is_maximizing = current_player == X
+    best_value = float('-inf') if is_maximizing else float('inf')
+    best_action = None
+
+    for action in actions(board):
+        result_board = result(board, action)
+        if winner(result_board) == current_player:
+            return action
+
+        if is_maximizing:
+            value = alpha_beta_value(result_board, best_value, float('inf'))
+            if value > best_value:
+                best_value = value
+                best_action = action
+        else:
+            value = alpha_beta_value(result_board, float('-inf'), best_value)
+            if value < best_value:
+                best_value = value
+                best_action = action
+
+    return best_action
+
+
+def board_key(board, symmetries=True):
+    """
+    Returns a hashable encoding of the board. With symmetries, all 8
+    rotations and reflections of a board share the same key.
+    """
+    weights = SYMMETRY_WEIGHTS if symmetries else SYMMETRY_WEIGHTS[:1]
+    return min(
+        sum(CELL_CODES[board[i][j]] * weight[i][j]
+            for i in range(3) for j in range(3))
+        for weight in weights
+    )
+
+
+def cached_value(board, symmetries=True):
+    """
+    Returns the minimax value of the board, solving each position
+    at most once per process through the transposition table.
+    """
+    key = board_key(board, symmetries)
+    if key in transposition_table:
+        return transposition_table[key]
+
+    if terminal(board):
+        value = utility(board)
+    elif player(board) == X:
+        value = max(cached_value(result(board, action), symmetries)
+                    for action in actions(board))
+    else:
+        value = min(cached_value(result(board, action), symmetries)
+                    for action in actions(board))
+
+    transposition_table[key] = value
+    return value
+
+
+def cached_minimax(board, symmetries=True):
+    """
+    Returns the optimal action for the current player on the board,
+    choosing the same action as minimax from cached position values.
+    """
+    if terminal(board):
+        return None
+
+    current_player = player(board)
+    is_maximizing = current_player == X
+    best_value = float('-inf') if is_maximizing else float('inf')
+    best_action = None
+
+    for action in actions(board):
+        result_board = result(board, action)
+        if winner(result_board) == current_player:
+            return action
+
+        value = cached_value(result_board, symmetries)
+        if (is_maximizing and value > best_value) or (not is_maximizing and value < best_value):
+            best_value = value
+            best_action = action
+
+    return best_action
+
+
+def load_book():
+    """
+    Returns the opening book, reading it on first use,
+    or False if it has not been generated.
+    """
+    global book
+    if book is None:
+        try:
+            with open(BOOK_PATH, "rb") as f:
+                data = f.read()
+        except OSError:
+            data = b""
+        book = data if len(data) == BOOK_SIZE else False
+    return book
+
+
+def book_entry(board):
+    """
+    Returns the (action, value) stored in the opening book for the board,
+    or None if there is no book or the board is not in it.
+    """
+    table = load_book()
+    if not table:
+        return None
+    entry = table[board_key(board, symmetries=False)]
+    if entry == BOOK_MISSING:
+        return None
+    cell = entry & 0x0F
+    action = None if cell == BOOK_NO_MOVE else (cell // 3, cell % 3)
+    return action, (entry >> 4) - 1